@@ -0,0 +1,290 @@
+#!/usr/bin/env python
+'''
+* Brett Slatkin, 2014, "effective Python"
+* Brett Slatkin's example code([GitHub](https://github.com/bslatkin/effectivepython))
+* I modified the example code a bit to confirm my understanding.
+* item29_lazy.py is written in Python 3.6
+
+Lazy, dependency-tracked derived attributes
+* VoltageResistance recomputes current on every voltage write,
+  even if nobody ever reads current
+* MysteriousResistor writes voltage as a side effect of reading ohms
+* Instead: mark dependents stale when an input changes,
+  and recompute them on the first read
+* a write only drops cached values when there are any: a flag per input
+  in the instance dict says whether something derived from it is cached,
+  so a write costs about as much as item29's setter however much is
+  derived from it
+* assigning a derived attribute directly marks its dependents stale too;
+  the price is that a cached read is a descriptor call, not a plain
+  attribute lookup
+'''
+from copy import copy
+from time import time
+
+from item29 import VoltageResistance
+
+
+def cached_flag(name):
+    # Present in the instance dict while something derived from name
+    # is cached there
+    return '_%s_cached' % name
+
+
+class source(object):
+    """
+    An input attribute. Assigning it marks every attribute
+    derived from it (directly or indirectly) as stale.
+    """
+    # Filled in by DerivedAttributes.__init_subclass__
+    dependents = ()
+
+    def __init__(self, default=None):
+        self.default = default
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.internal_name = '_' + name
+        self.flag = cached_flag(name)
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return instance.__dict__.get(self.internal_name, self.default)
+
+    def __set__(self, instance, value):
+        instance_dict = instance.__dict__
+        instance_dict[self.internal_name] = value
+        # Nothing cached since the last write: nothing to drop
+        if self.flag in instance_dict:
+            del instance_dict[self.flag]
+            for name in self.dependents:
+                instance_dict.pop(name, None)
+
+
+class derived(object):
+    """
+    A derived attribute computed from the given inputs and cached in
+    the instance dict until one of its inputs changes. It is a data
+    descriptor so that assigning it directly is seen too: the assigned
+    value replaces the cached one and its own dependents become stale.
+    """
+    # Filled in by DerivedAttributes.__init_subclass__
+    dependents = ()
+    input_flags = ()
+
+    def __init__(self, *inputs):
+        self.inputs = inputs
+
+    def __call__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+        return self
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.flag = cached_flag(name)
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        instance_dict = instance.__dict__
+        try:
+            return instance_dict[self.name]
+        except KeyError:
+            pass
+        return self._store(instance_dict, self.func(instance))
+
+    def __set__(self, instance, value):
+        instance_dict = instance.__dict__
+        if self.flag in instance_dict:
+            del instance_dict[self.flag]
+            for name in self.dependents:
+                instance_dict.pop(name, None)
+        self._store(instance_dict, value)
+
+    def _store(self, instance_dict, value):
+        instance_dict[self.name] = value
+        for flag in self.input_flags:
+            instance_dict[flag] = True
+        return value
+
+
+class DerivedAttributes(object):
+    """
+    Base class that builds the dependency graph once per class:
+    _dependents maps each attribute to all derived attributes
+    that must be invalidated when it changes. Each descriptor also
+    gets its own part of the graph, so __set__ needs no lookups.
+    """
+    _dependents = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        descriptors = {}
+        for klass in reversed(cls.__mro__):
+            for name, value in vars(klass).items():
+                if isinstance(value, (source, derived)):
+                    descriptors[name] = value
+        # Each class gets its own copies: a subclass may add dependents
+        # that its base class must not see
+        for name, value in descriptors.items():
+            if vars(cls).get(name) is not value:
+                value = copy(value)
+                setattr(cls, name, value)
+                descriptors[name] = value
+
+        direct = {}
+        for name, value in descriptors.items():
+            if isinstance(value, derived):
+                for input_name in value.inputs:
+                    direct.setdefault(input_name, set()).add(name)
+
+        # Transitive closure: power depends on current depends on voltage
+        dependents = {}
+        for name in direct:
+            seen = set()
+            pending = list(direct[name])
+            while pending:
+                dependent = pending.pop()
+                if dependent in seen:
+                    continue
+                seen.add(dependent)
+                pending.extend(direct.get(dependent, ()))
+            dependents[name] = tuple(sorted(seen))
+        cls._dependents = dependents
+
+        for name, value in descriptors.items():
+            value.dependents = dependents.get(name, ())
+            if isinstance(value, derived):
+                value.input_flags = tuple(
+                    cached_flag(input_name)
+                    for input_name, names in dependents.items()
+                    if name in names)
+
+    def stale(self, name):
+        """True if the derived attribute will be recomputed on next read"""
+        return name not in self.__dict__
+
+
+class EagerPowerResistance(VoltageResistance):
+    """item29's approach, keeping power up to date as well"""
+    @property
+    def voltage(self):
+        return self._voltage
+
+    @voltage.setter
+    def voltage(self, voltage):
+        self._voltage = voltage
+        self.current = voltage / self.ohms
+        self.power = voltage * self.current
+
+
+# current is only computed when somebody reads it
+class LazyVoltageResistance(DerivedAttributes):
+    ohms = source()
+    voltage = source(0)
+
+    def __init__(self, ohms):
+        self.ohms = ohms
+
+    @derived('voltage', 'ohms')
+    def current(self):
+        return self.voltage / self.ohms
+
+    @derived('voltage', 'current')
+    def power(self):
+        return self.voltage * self.current
+
+
+# no side effects in getters: voltage is derived from ohms and current
+class LazyMysteriousResistor(DerivedAttributes):
+    ohms = source()
+    current = source(0)
+
+    def __init__(self, ohms):
+        self.ohms = ohms
+
+    @derived('ohms', 'current')
+    def voltage(self):
+        return self.ohms * self.current
+
+
+if __name__=="__main__":
+    print("current is computed on first read, not on every voltage write")
+    r1 = LazyVoltageResistance(1e3)
+    r1.voltage = 10
+    print('stale(current):', r1.stale('current'))
+    print('current: %5r amps' % r1.current)
+    print('stale(current):', r1.stale('current'))
+    print('power:   %5r watts' % r1.power)
+    print("")
+
+    print("writing voltage marks current and power stale")
+    r1.voltage = 20
+    print('stale(current), stale(power):',
+          r1.stale('current'), r1.stale('power'))
+    print('current: %5r amps, power: %5r watts' % (r1.current, r1.power))
+    print("")
+
+    print("the dependency graph is built once per class")
+    print(LazyVoltageResistance._dependents)
+    print("")
+
+    print("assigning a derived attribute marks its dependents stale too")
+    r1.current = 1
+    print('stale(power):', r1.stale('power'))
+    print('power:   %5r watts' % r1.power)
+    print("")
+
+    print("reading ohms has no side effect anymore")
+    r2 = LazyMysteriousResistor(10)
+    r2.current = 0.01
+    print('r2.ohms == %5r' % r2.ohms)
+    print('r2.voltage == %5r' % r2.voltage)
+    print("")
+
+    print("write-heavy workload: many voltage writes, one read")
+    writes = 1000000
+    eager = VoltageResistance(1e3)
+    start = time()
+    for i in range(writes):
+        eager.voltage = i
+    eager.current
+    end = time()
+    print('VoltageResistance:      took %.3f seconds (current only)' %
+          (end - start))
+
+    eager = EagerPowerResistance(1e3)
+    start = time()
+    for i in range(writes):
+        eager.voltage = i
+    eager.power
+    end = time()
+    print('EagerPowerResistance:   took %.3f seconds (current and power)' %
+          (end - start))
+
+    lazy = LazyVoltageResistance(1e3)
+    start = time()
+    for i in range(writes):
+        lazy.voltage = i
+    lazy.power
+    end = time()
+    print('LazyVoltageResistance:  took %.3f seconds (current and power)' %
+          (end - start))
+    assert eager.current == lazy.current and eager.power == lazy.power
+    print("a write costs one descriptor call however much is derived from it;")
+    print("an eager setter pays for every derived value on every write")
+    print("")
+
+    print("read-heavy workload: a cached read is one __get__ call, no recompute")
+    start = time()
+    for _ in range(writes):
+        eager.current
+    end = time()
+    print('EagerPowerResistance:   took %.3f seconds' % (end - start))
+    start = time()
+    for _ in range(writes):
+        lazy.current
+    end = time()
+    print('LazyVoltageResistance:  took %.3f seconds' % (end - start))
@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+'''
+* Brett Slatkin, 2014, "effective Python"
+* Brett Slatkin's example code([GitHub](https://github.com/bslatkin/effectivepython))
+* I modified the example code a bit to confirm my understanding.
+* item30_async.py is written in Python 3.7
+
+Awaiting quota instead of busy-retrying deduct()
+* item30's deduct() returns False when the quota runs out,
+  so callers spin in a retry loop
+* the bucket knows exactly when quota comes back (the reset time),
+  so sleep until then with loop.call_later instead of polling
+* waiters are woken in FIFO order: a big request at the head of the
+  queue is not starved by a stream of small ones behind it
+'''
+import asyncio
+from collections import deque
+from time import process_time, time
+
+from item30_ratelimit import TokenBucket
+
+
+class AsyncBucket(object):
+    """
+    asyncio front end for a TokenBucket: acquire() waits until
+    the quota is available, without polling.
+    """
+    def __init__(self, bucket):
+        self.bucket = bucket
+        self._waiters = deque()   # (future, amount) in arrival order
+        self._timer = None
+
+    def __repr__(self):
+        return 'AsyncBucket(%r, waiters=%d)' % (self.bucket, len(self._waiters))
+
+    def try_deduct(self, amount=1):
+        """Non-blocking; never jumps ahead of queued waiters"""
+        if self._waiters:
+            return False
+        return self.bucket.deduct(amount)
+
+    async def acquire(self, amount=1):
+        if amount > self.bucket.capacity:
+            raise ValueError('%d tokens exceeds capacity' % amount)
+        if self.try_deduct(amount):
+            return
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        waiter = (future, amount)
+        self._waiters.append(waiter)
+        if self._timer is None:
+            self._wake()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.cancelled():
+                # Give up our place; if we were at the head, the timer was
+                # set for our amount, so set it again for the next waiter
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+            else:
+                # Granted, but cancelled before we resumed
+                self.bucket.refund(amount)
+            self._reschedule()
+            raise
+
+    def _reschedule(self):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._wake()
+
+    def _wake(self):
+        self._timer = None
+        waiters = self._waiters
+        while waiters:
+            future, amount = waiters[0]
+            if future.done():
+                # Cancelled, but its task hasn't resumed to remove it yet
+                waiters.popleft()
+                continue
+            if self.bucket.deduct(amount):
+                waiters.popleft()
+                future.set_result(None)
+                continue
+            delay = self.bucket.wait_time(amount)
+            if delay > 0:
+                loop = asyncio.get_running_loop()
+                self._timer = loop.call_later(delay, self._wake)
+                return
+
+
+async def worker(bucket, name, jobs, done):
+    for _ in range(jobs):
+        await bucket.acquire(1)
+        done.append(name)
+
+
+async def spinning_worker(bucket, jobs):
+    for _ in range(jobs):
+        while not bucket.deduct(1):
+            await asyncio.sleep(0)  # busy retry
+
+
+async def main():
+    print("20 workers sharing 5 tokens per 0.1 seconds")
+    bucket = AsyncBucket(TokenBucket(5, 0.1, continuous=False))
+    done = []
+    start, cpu_start = time(), process_time()
+    await asyncio.gather(*[worker(bucket, i, 2, done) for i in range(20)])
+    end, cpu_end = time(), process_time()
+    print('awaiting:       took %.3f seconds, %.3f CPU seconds' %
+          (end - start, cpu_end - cpu_start))
+    print('FIFO order of the first 20 grants:', done[:20])
+
+    bucket = TokenBucket(5, 0.1, continuous=False)
+    start, cpu_start = time(), process_time()
+    await asyncio.gather(*[spinning_worker(bucket, 2) for _ in range(20)])
+    end, cpu_end = time(), process_time()
+    print('busy retrying:  took %.3f seconds, %.3f CPU seconds' %
+          (end - start, cpu_end - cpu_start))
+    print("")
+
+    print("a large request at the head is not starved by small ones")
+    bucket = AsyncBucket(TokenBucket(10, 0.1))
+    await bucket.acquire(10)
+    order = []
+
+    async def request(name, amount):
+        await bucket.acquire(amount)
+        order.append(name)
+
+    await asyncio.gather(request('big', 8), request('small-1', 1),
+                         request('small-2', 1))
+    print('order:', order)
+    print("")
+
+    print("cancelled waiters give up their place")
+    bucket = AsyncBucket(TokenBucket(1, 0.1, continuous=False))
+    await bucket.acquire(1)
+    try:
+        await asyncio.wait_for(bucket.acquire(1), timeout=0.01)
+    except asyncio.TimeoutError:
+        print('timed out:', bucket)
+    await bucket.acquire(1)
+    print('next waiter served:', bucket)
+    print("")
+
+    print("cancelling the head waiter reschedules the next one")
+    bucket = AsyncBucket(TokenBucket(10, 1))
+    await bucket.acquire(10)
+    start = time()
+    head = asyncio.ensure_future(bucket.acquire(10))
+    await asyncio.sleep(0)
+    small = asyncio.ensure_future(bucket.acquire(1))
+    await asyncio.sleep(0.05)
+    head.cancel()
+    await small
+    print('small waiter granted after %.2f seconds (not 1.00)' %
+          (time() - start))
+
+
+if __name__=="__main__":
+    asyncio.run(main())
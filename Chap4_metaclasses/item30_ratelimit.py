@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+'''
+* Brett Slatkin, 2014, "effective Python"
+* Brett Slatkin's example code([GitHub](https://github.com/bslatkin/effectivepython))
+* I modified the example code a bit to confirm my understanding.
+* item30_ratelimit.py is written in Python 3.7
+
+A thread-safe token-bucket rate limiter built from the item30 Bucket
+* fill/deduct call datetime.now() and do timedelta arithmetic on every call
+* time.monotonic_ns() is cheaper, never jumps backwards, and gives integers
+* the quota level is kept in token-nanoseconds, so refill is exact integer math
+* one Lock per bucket: threads only contend when they share a bucket
+* the goal is correctness under threads, not raw speed: one deduct still
+  costs a bit more than item30's, which takes no lock
+'''
+from threading import Lock, Thread
+from time import monotonic_ns, time
+
+from item30 import Bucket, fill, deduct
+
+NS_PER_SECOND = 10 ** 9
+
+
+class TokenBucket(object):
+    """
+    A token bucket holding at most capacity tokens per period seconds.
+
+    continuous=True:  tokens trickle back in at capacity/period per second
+    continuous=False: fixed windows, the bucket is refilled to capacity
+                      at the start of every period (like item30's fill)
+    """
+    def __init__(self, capacity, period, continuous=True, clock=monotonic_ns):
+        if capacity <= 0:
+            raise ValueError('capacity must be > 0')
+        if period <= 0:
+            raise ValueError('period must be > 0')
+        self.capacity = capacity
+        self.period_ns = int(period * NS_PER_SECOND)
+        self.continuous = continuous
+        self._clock = clock
+        self._lock = Lock()
+        # One token == period_ns units, so refill needs no division
+        self._limit = capacity * self.period_ns
+        self._level = self._limit
+        self._last = clock()
+
+    def __repr__(self):
+        return ('TokenBucket(capacity=%d, quota=%d)' %
+                (self.capacity, self.quota))
+
+    def _refill(self, now):
+        # Caller must hold self._lock
+        elapsed = now - self._last
+        if self.continuous:
+            if elapsed > 0:
+                level = self._level + elapsed * self.capacity
+                self._level = level if level < self._limit else self._limit
+                self._last = now
+        elif elapsed >= self.period_ns:
+            # Align to window boundaries so windows don't drift
+            self._last += elapsed - elapsed % self.period_ns
+            self._level = self._limit
+
+    @property
+    def quota(self):
+        """Number of whole tokens available right now"""
+        with self._lock:
+            self._refill(self._clock())
+            return self._level // self.period_ns
+
+    def deduct(self, amount=1):
+        """
+        Take amount tokens if they are all available, else return False.
+        Amounts above capacity are never available.
+        """
+        if amount <= 0:
+            raise ValueError('amount must be > 0')
+        period_ns = self.period_ns
+        cost = amount * period_ns
+        with self._lock:
+            # _refill inlined, with locals: this is the hot path
+            now = self._clock()
+            last = self._last
+            if self.continuous:
+                level = self._level
+                if now > last:
+                    level += (now - last) * self.capacity
+                    limit = self._limit
+                    if level > limit:
+                        level = limit
+                    self._last = now
+            elif now - last >= period_ns:
+                self._last = now - (now - last) % period_ns
+                level = self._limit
+            else:
+                level = self._level
+            if level < cost:
+                self._level = level
+                return False
+            self._level = level - cost
+            return True
+
+    def refund(self, amount=1):
+        """Give back tokens taken by deduct() but not used"""
+        if amount <= 0:
+            raise ValueError('amount must be > 0')
+        with self._lock:
+            self._level = min(self._level + amount * self.period_ns,
+                              self._limit)
+
+    def wait_time(self, amount=1):
+        """Seconds until amount tokens will be available (0.0 if now)"""
+        if amount > self.capacity:
+            raise ValueError('%d tokens exceeds capacity' % amount)
+        cost = amount * self.period_ns
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            missing = cost - self._level
+            if missing <= 0:
+                return 0.0
+            if self.continuous:
+                # Round up so the caller never wakes up too early
+                wait_ns = -(-missing // self.capacity)
+            else:
+                wait_ns = self._last + self.period_ns - now
+        return wait_ns / NS_PER_SECOND
+
+
+def run_deducts(bucket, count, results):
+    granted = 0
+    for _ in range(count):
+        if bucket.deduct(1):
+            granted += 1
+    results.append(granted)
+
+
+if __name__=="__main__":
+    print("continuous refill")
+    clock_now = [0]
+    bucket = TokenBucket(10, 1, clock=lambda: clock_now[0])
+    print(bucket)
+    for _ in range(10):
+        bucket.deduct()
+    print('After 10 deducts:', bucket, 'deduct ->', bucket.deduct())
+    print('wait_time(1) == %.3f seconds' % bucket.wait_time(1))
+    clock_now[0] += NS_PER_SECOND // 2
+    print('0.5 seconds later:', bucket)
+    print("")
+
+    print("fixed window: nothing comes back until the next period")
+    clock_now = [0]
+    bucket = TokenBucket(10, 1, continuous=False, clock=lambda: clock_now[0])
+    bucket.deduct(10)
+    clock_now[0] += NS_PER_SECOND // 2
+    print('0.5 seconds later:', bucket)
+    print('wait_time(1) == %.3f seconds' % bucket.wait_time(1))
+    clock_now[0] += NS_PER_SECOND // 2
+    print('1.0 seconds later:', bucket)
+    print("")
+
+    count = 200000
+    print("single thread: item30 deduct vs TokenBucket.deduct")
+    old = Bucket(60)
+    fill(old, count)
+    start = time()
+    for _ in range(count):
+        deduct(old, 1)
+    end = time()
+    print('item30 deduct:       %10.0f deducts per second' %
+          (count / (end - start)))
+
+    bucket = TokenBucket(count, 60)
+    start = time()
+    run_deducts(bucket, count, [])
+    end = time()
+    print('TokenBucket.deduct:  %10.0f deducts per second' %
+          (count / (end - start)))
+    print("the difference is mostly the Lock that item30 doesn't take")
+    try:
+        bucket.deduct(-1)
+    except ValueError:
+        print('ValueError Expected: deduct(-1) would add tokens')
+    print("")
+
+    print("many threads sharing one bucket")
+    for num_threads in (1, 2, 4, 8):
+        bucket = TokenBucket(count, 60, continuous=False)
+        results = []
+        threads = []
+        start = time()
+        for _ in range(num_threads):
+            thread = Thread(target=run_deducts,
+                            args=(bucket, count // num_threads, results))
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+        end = time()
+        # The lock guarantees that no deduct is lost or granted twice
+        assert sum(results) == (count // num_threads) * num_threads
+        assert bucket.quota == count - sum(results)
+        print('%d threads: %10.0f deducts per second' %
+              (num_threads, count / (end - start)))
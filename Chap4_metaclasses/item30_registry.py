@@ -0,0 +1,269 @@
+#!/usr/bin/env python
+'''
+* Brett Slatkin, 2014, "effective Python"
+* Brett Slatkin's example code([GitHub](https://github.com/bslatkin/effectivepython))
+* I modified the example code a bit to confirm my understanding.
+* item30_registry.py is written in Python 3.7
+
+A keyed registry of item30 Buckets for millions of clients
+* each Bucket instance costs a __dict__, two datetimes and a timedelta
+* instead, keep one slot per key in parallel arrays of 64-bit integers
+* windows are reset lazily, only when a key is touched after its period
+* idle keys are evicted and their slots reused
+'''
+from array import array
+from time import monotonic_ns, time
+import tracemalloc
+
+from item30 import Bucket
+
+NS_PER_SECOND = 10 ** 9
+
+
+class BucketRegistry(object):
+    """
+    Per-key quotas with the semantics of the second item30 Bucket:
+    quota == max_quota - quota_consumed, fill() starts a new period
+    once the old one expired, deduct() fails after the period is over.
+    """
+    def __init__(self, period, clock=monotonic_ns):
+        self.period_ns = int(period * NS_PER_SECOND)
+        self._clock = clock
+        self._index = {}          # key -> slot
+        self._keys = []           # slot -> key (None if free)
+        self._free = []           # free slots to reuse
+        self._max_quota = array('q')
+        self._consumed = array('q')
+        self._reset_time = array('q')
+        self._last_used = array('q')
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __getitem__(self, key):
+        self._slot(key)
+        return BucketView(self, key)
+
+    def _slot(self, key):
+        slot = self._index.get(key)
+        if slot is None:
+            now = self._clock()
+            if self._free:
+                slot = self._free.pop()
+                self._keys[slot] = key
+                self._max_quota[slot] = 0
+                self._consumed[slot] = 0
+                self._reset_time[slot] = now
+                self._last_used[slot] = now
+            else:
+                slot = len(self._keys)
+                self._keys.append(key)
+                self._max_quota.append(0)
+                self._consumed.append(0)
+                self._reset_time.append(now)
+                self._last_used.append(now)
+            self._index[key] = slot
+        return slot
+
+    def quota(self, key):
+        slot = self._index.get(key)
+        if slot is None:
+            return 0
+        return self._max_quota[slot] - self._consumed[slot]
+
+    def fill(self, key, amount):
+        """
+        Like item30's fill(): the quota does not carry over
+        from one period to the next
+        """
+        slot = self._slot(key)
+        now = self._clock()
+        self._last_used[slot] = now
+        if now - self._reset_time[slot] > self.period_ns:
+            self._max_quota[slot] = 0
+            self._consumed[slot] = 0
+            self._reset_time[slot] = now
+        self._max_quota[slot] += amount
+
+    def deduct(self, key, amount):
+        slot = self._index.get(key)
+        if slot is None:
+            return False
+        now = self._clock()
+        self._last_used[slot] = now
+        if now - self._reset_time[slot] > self.period_ns:
+            return False
+        consumed = self._consumed[slot] + amount
+        if consumed > self._max_quota[slot]:
+            return False
+        self._consumed[slot] = consumed
+        return True
+
+    def deduct_many(self, keys, amounts):
+        """
+        Batch deduct: one clock read and local array references
+        for the whole batch. Returns a list of booleans.
+        """
+        now = self._clock()
+        period_ns = self.period_ns
+        index = self._index
+        max_quota = self._max_quota
+        consumed = self._consumed
+        reset_time = self._reset_time
+        last_used = self._last_used
+        results = []
+        append = results.append
+        for key, amount in zip(keys, amounts):
+            slot = index.get(key)
+            if slot is None:
+                append(False)
+                continue
+            last_used[slot] = now
+            if now - reset_time[slot] > period_ns:
+                append(False)
+                continue
+            total = consumed[slot] + amount
+            if total > max_quota[slot]:
+                append(False)
+                continue
+            consumed[slot] = total
+            append(True)
+        return results
+
+    def evict_idle(self, idle_seconds):
+        """Forget keys not touched in idle_seconds; returns the count"""
+        cutoff = self._clock() - int(idle_seconds * NS_PER_SECOND)
+        evicted = 0
+        for slot, last_used in enumerate(self._last_used):
+            key = self._keys[slot]
+            if key is not None and last_used < cutoff:
+                del self._index[key]
+                self._keys[slot] = None
+                self._free.append(slot)
+                evicted += 1
+        return evicted
+
+
+class BucketView(object):
+    """
+    A Bucket-like view of one registry key, so code written against
+    the second item30 Bucket (quota property getter and setter) still works.
+    The view holds the key, not its slot: once the key is evicted its slot
+    may belong to another key, so the slot is looked up on every access.
+    """
+    __slots__ = ('_registry', '_key')
+
+    def __init__(self, registry, key):
+        self._registry = registry
+        self._key = key
+
+    def __repr__(self):
+        return ('Bucket(max_quota=%d, quota_consumed=%d)' %
+                (self.max_quota, self.quota_consumed))
+
+    @property
+    def max_quota(self):
+        slot = self._registry._index.get(self._key)
+        return 0 if slot is None else self._registry._max_quota[slot]
+
+    @property
+    def quota_consumed(self):
+        slot = self._registry._index.get(self._key)
+        return 0 if slot is None else self._registry._consumed[slot]
+
+    @property
+    def quota(self):
+        return self.max_quota - self.quota_consumed
+
+    @quota.setter
+    def quota(self, amount):
+        registry = self._registry
+        # An evicted key gets a fresh slot, like a new item30 Bucket
+        slot = registry._slot(self._key)
+        delta = registry._max_quota[slot] - amount
+        if amount == 0:
+            # Quota being reset for a new period
+            registry._consumed[slot] = 0
+            registry._max_quota[slot] = 0
+        elif delta < 0:
+            # Quota being filled for the new period
+            assert registry._consumed[slot] == 0
+            registry._max_quota[slot] = amount
+        else:
+            # Quota being consumed during the period
+            assert registry._max_quota[slot] >= registry._consumed[slot]
+            registry._consumed[slot] += delta
+
+
+if __name__=="__main__":
+    print("one registry instead of one Bucket per client")
+    clock_now = [0]
+    registry = BucketRegistry(60, clock=lambda: clock_now[0])
+    registry.fill('client-a', 100)
+    print('client-a', registry['client-a'])
+    print('deduct 99:', registry.deduct('client-a', 99))
+    print('deduct 3: ', registry.deduct('client-a', 3))
+    print('Still', registry['client-a'])
+    print("")
+
+    print("the quota property setter works like item30's Bucket")
+    view = registry['client-b']
+    view.quota = 10
+    view.quota = 7
+    print('client-b', view, 'quota ==', view.quota)
+    print("")
+
+    print("lazy window reset: the next fill after the period starts over")
+    clock_now[0] += 61 * NS_PER_SECOND
+    print('deduct after the period:', registry.deduct('client-a', 1))
+    registry.fill('client-a', 5)
+    print('client-a', registry['client-a'])
+    print("")
+
+    print("idle-key eviction")
+    clock_now[0] += 3600 * NS_PER_SECOND
+    registry.fill('client-c', 1)
+    view_a = registry['client-a']
+    print('evicted:', registry.evict_idle(600), 'remaining:', len(registry))
+    registry.fill('client-d', 5)
+    view_a.quota = 0
+    print('an old view of client-a leaves client-d alone:',
+          registry['client-d'])
+    print("")
+
+    count = 100000
+    print("memory for %d clients" % count)
+    tracemalloc.start()
+    buckets = {}
+    for i in range(count):
+        buckets[i] = Bucket(60)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print('item30 Bucket:  %5.0f bytes per key' % (size / count))
+    del buckets
+
+    tracemalloc.start()
+    registry = BucketRegistry(60)
+    for i in range(count):
+        registry.fill(i, 10)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print('BucketRegistry: %5.0f bytes per key' % (size / count))
+    print("")
+
+    print("batch deduct_many vs deduct one key at a time")
+    keys = list(range(count))
+    amounts = [1] * count
+    start = time()
+    for key, amount in zip(keys, amounts):
+        registry.deduct(key, amount)
+    end = time()
+    print('deduct:      took %.3f seconds' % (end - start))
+    start = time()
+    results = registry.deduct_many(keys, amounts)
+    end = time()
+    assert all(results)
+    print('deduct_many: took %.3f seconds' % (end - start))
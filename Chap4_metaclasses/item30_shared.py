@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+'''
+* Brett Slatkin, 2014, "effective Python"
+* Brett Slatkin's example code([GitHub](https://github.com/bslatkin/effectivepython))
+* I modified the example code a bit to confirm my understanding.
+* item30_shared.py is written in Python 3.8
+
+One item30 Bucket shared by several worker processes
+* with one process per core, each process has its own Bucket,
+  so a global quota is enforced N times too loosely
+* keep max_quota, quota_consumed and reset_time in a shared memory
+  segment instead of in the instance __dict__
+* a multiprocessing.Lock makes each fill/deduct atomic across processes
+* CLOCK_MONOTONIC is system wide, so every process agrees on reset_time
+'''
+from multiprocessing import Lock, Process, Queue
+from multiprocessing.shared_memory import SharedMemory
+from time import monotonic_ns, time
+import os
+
+NS_PER_SECOND = 10 ** 9
+
+# Slots in the shared int64 array
+MAX_QUOTA, QUOTA_CONSUMED, RESET_TIME, PERIOD = range(4)
+
+
+class SharedBucket(object):
+    """
+    The second item30 Bucket with its state in shared memory.
+    Pass it to child processes as a Process argument: the segment
+    is re-attached by name and the lock is inherited.
+    """
+    def __init__(self, period, name=None, lock=None):
+        self._shm = SharedMemory(name=name, create=True, size=4 * 8)
+        # Forked children inherit this object, so remember who created it
+        self._owner_pid = os.getpid()
+        self._lock = lock if lock is not None else Lock()
+        self._state = self._shm.buf.cast('q')
+        self._state[MAX_QUOTA] = 0
+        self._state[QUOTA_CONSUMED] = 0
+        self._state[RESET_TIME] = monotonic_ns()
+        self._state[PERIOD] = int(period * NS_PER_SECOND)
+
+    def __getstate__(self):
+        return {'name': self._shm.name, 'lock': self._lock}
+
+    def __setstate__(self, state):
+        self._shm = SharedMemory(name=state['name'])
+        self._owner_pid = None
+        self._lock = state['lock']
+        self._state = self._shm.buf.cast('q')
+
+    def __repr__(self):
+        return ('SharedBucket(max_quota=%d, quota_consumed=%d)' %
+                (self.max_quota, self.quota_consumed))
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    @property
+    def max_quota(self):
+        return self._state[MAX_QUOTA]
+
+    @property
+    def quota_consumed(self):
+        return self._state[QUOTA_CONSUMED]
+
+    @property
+    def quota(self):
+        with self._lock:
+            return self._state[MAX_QUOTA] - self._state[QUOTA_CONSUMED]
+
+    def fill(self, amount):
+        """
+        Like item30's fill(): the quota does not carry over
+        from one period to the next
+        """
+        state = self._state
+        with self._lock:
+            now = monotonic_ns()
+            if now - state[RESET_TIME] > state[PERIOD]:
+                state[MAX_QUOTA] = 0
+                state[QUOTA_CONSUMED] = 0
+                state[RESET_TIME] = now
+            state[MAX_QUOTA] += amount
+
+    def deduct(self, amount):
+        state = self._state
+        with self._lock:
+            if monotonic_ns() - state[RESET_TIME] > state[PERIOD]:
+                return False
+            consumed = state[QUOTA_CONSUMED] + amount
+            if consumed > state[MAX_QUOTA]:
+                return False
+            state[QUOTA_CONSUMED] = consumed
+            return True
+
+    def close(self):
+        """Detach; the creating process also frees the segment"""
+        self._state.release()
+        self._shm.close()
+        if self._owner_pid == os.getpid():
+            self._shm.unlink()
+
+
+def consume(bucket, results):
+    granted = 0
+    while bucket.deduct(1):
+        granted += 1
+    results.put(granted)
+    bucket.close()
+
+
+if __name__=="__main__":
+    print("4 processes draining one global quota of 20000")
+    bucket = SharedBucket(60)
+    bucket.fill(20000)
+    print(bucket)
+    results = Queue()
+    procs = [Process(target=consume, args=(bucket, results))
+             for _ in range(4)]
+    start = time()
+    for proc in procs:
+        proc.start()
+    granted = [results.get() for _ in procs]
+    for proc in procs:
+        proc.join()
+    end = time()
+    print('granted per process:', granted)
+    print('total granted: %d (never more than the quota)' % sum(granted))
+    assert sum(granted) == 20000
+    print('Finally', bucket)
+    print('Took %.3f seconds, %.0f deducts per second' %
+          (end - start, sum(granted) / (end - start)))
+    bucket.close()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+'''
+* Brett Slatkin, 2014, "effective Python"
+* Brett Slatkin's example code([GitHub](https://github.com/bslatkin/effectivepython))
+* I modified the example code a bit to confirm my understanding.
+* item32_batch.py is written in Python 3.6
+
+Batched, prefetching lazy attributes
+* LazyDB.__getattr__ computes one missing attribute at a time,
+  so a real database costs N round trips for N fields
+* on the first miss, load a whole group of fields in one round trip
+* groups are either configured per class (prefetch_groups) or learned
+  from which fields instances of the class usually read together
+'''
+from collections import Counter
+from time import sleep, time
+
+
+class AccessStats(object):
+    """Per-class counters used to tune the prefetch"""
+    def __init__(self):
+        self.round_trips = 0
+        self.fields_loaded = 0
+        self.prefetch_hits = 0
+        self.first_reads = Counter()     # field -> instances that read it
+        self.read_together = {}          # field -> Counter of co-read fields
+
+    def __repr__(self):
+        return ('AccessStats(round_trips=%d, fields_loaded=%d, '
+                'prefetch_hits=%d)' %
+                (self.round_trips, self.fields_loaded, self.prefetch_hits))
+
+    def record_read(self, name, already_read):
+        self.first_reads[name] += 1
+        together = self.read_together.setdefault(name, Counter())
+        for other in already_read:
+            together[other] += 1
+            self.read_together.setdefault(other, Counter())[name] += 1
+
+    def companions(self, name, threshold):
+        """Fields read by at least threshold of the instances reading name"""
+        seen = self.first_reads[name]
+        if not seen:
+            return ()
+        together = self.read_together.get(name, {})
+        return tuple(other for other, count in together.items()
+                     if count / seen >= threshold)
+
+
+class BatchLazyRecord(object):
+    """
+    Subclasses implement load_fields(names) -> dict, one round trip.
+
+    prefetch_groups: tuples of fields always loaded together
+    learn_threshold: also prefetch fields co-read with the missing
+                     one by at least this fraction of instances
+                     (None disables learning)
+    """
+    prefetch_groups = ()
+    learn_threshold = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.stats = AccessStats()
+        cls._group_of = {}
+        for group in cls.prefetch_groups:
+            for name in group:
+                cls._group_of[name] = group
+
+    def __init__(self, key):
+        self.key = key
+        self._prefetched = {}
+        self._read = set()
+
+    def load_fields(self, names):
+        raise NotImplementedError
+
+    def __getattr__(self, name):
+        # Only reached on a miss; private names are never lazy
+        if name.startswith('_'):
+            raise AttributeError(name)
+        cls = type(self)
+        stats = cls.stats
+        prefetched = self._prefetched
+        if name in prefetched:
+            stats.prefetch_hits += 1
+            value = prefetched.pop(name)
+        else:
+            wanted = set(cls._group_of.get(name, ()))
+            if cls.learn_threshold is not None:
+                wanted.update(stats.companions(name, cls.learn_threshold))
+            # Never reload what this instance already has
+            wanted.difference_update(self._read, prefetched)
+            wanted.add(name)
+            values = self.load_fields(sorted(wanted))
+            stats.round_trips += 1
+            stats.fields_loaded += len(values)
+            if name not in values:
+                raise AttributeError('%s is missing' % name)
+            value = values.pop(name)
+            prefetched.update(values)
+        stats.record_read(name, self._read)
+        self._read.add(name)
+        setattr(self, name, value)  # later reads never reach __getattr__
+        return value
+
+
+# A fake database: 1 millisecond per round trip, whatever the field count
+ROWS = {
+    key: {'name': 'user%d' % key, 'email': 'user%d@example.com' % key,
+          'plan': 'free', 'created': 1500000000 + key, 'avatar': b'...'}
+    for key in range(100)
+}
+
+
+def fetch(key, names):
+    sleep(0.001)
+    row = ROWS[key]
+    return {name: row[name] for name in names if name in row}
+
+
+class OneAtATimeUser(BatchLazyRecord):
+    """Behaves like LazyDB: one round trip per missing attribute"""
+    def load_fields(self, names):
+        return fetch(self.key, names)
+
+
+class GroupedUser(BatchLazyRecord):
+    prefetch_groups = (('name', 'email', 'plan'),)
+
+    def load_fields(self, names):
+        return fetch(self.key, names)
+
+
+class LearningUser(BatchLazyRecord):
+    learn_threshold = 0.8
+
+    def load_fields(self, names):
+        return fetch(self.key, names)
+
+
+def read_profile(user):
+    return (user.name, user.email, user.plan, user.name)
+
+
+if __name__=="__main__":
+    for cls in (OneAtATimeUser, GroupedUser, LearningUser):
+        start = time()
+        for key in ROWS:
+            read_profile(cls(key))
+        end = time()
+        print('%-15s took %.3f seconds, %r' %
+              (cls.__name__, end - start, cls.stats))
+    print("")
+
+    print("fields LearningUser learned to read together with name:")
+    print(LearningUser.stats.companions('name', LearningUser.learn_threshold))
+    print("")
+
+    print("a missing field still raises AttributeError")
+    try:
+        GroupedUser(0).bad_name
+    except AttributeError:
+        print('AttributeError Expected')
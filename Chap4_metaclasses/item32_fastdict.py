@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+'''
+* Brett Slatkin, 2014, "effective Python"
+* Brett Slatkin's example code([GitHub](https://github.com/bslatkin/effectivepython))
+* I modified the example code a bit to confirm my understanding.
+* item32_fastdict.py is written in Python 3.6
+
+Exposing dict keys as attributes without __getattribute__
+* DictionaryDB.__getattribute__ runs Python code on every attribute
+  access, including methods, plus a super() call and a dict lookup
+* DictRecord: make the backing dict the instance __dict__ itself,
+  so reads are ordinary attribute lookups and the dict stays live
+* record_class(keys): generate one specialized class per key set with
+  __slots__; reads go through C-level slot descriptors
+'''
+from functools import lru_cache
+from time import time
+
+
+# Same as item32 (which only runs on Python 2 because of its indentation)
+class DictionaryDB(object):
+    def __init__(self, data):
+        self._data = data
+
+    def __getattribute__(self, name):
+        data_dict = super(DictionaryDB, self).__getattribute__('_data')
+        return data_dict[name]
+
+
+class DictRecord(object):
+    """
+    A live attribute view of data: no copy, and changes made either
+    through the dict or through the attributes are visible on both sides.
+    Keys must be strings.
+    """
+    def __init__(self, data):
+        self.__dict__ = data
+
+
+@lru_cache(maxsize=None)
+def record_class(keys):
+    """A slotted class with one attribute per key, generated once"""
+    keys = tuple(keys)
+
+    def __init__(self, data):
+        for key in keys:
+            setattr(self, key, data[key])
+
+    def to_dict(self):
+        return {key: getattr(self, key) for key in keys}
+
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__, self.to_dict())
+
+    name = 'Record_' + '_'.join(keys)
+    return type(name, (object,), {
+        '__slots__': keys,
+        '__init__': __init__,
+        'to_dict': to_dict,
+        '__repr__': __repr__,
+    })
+
+
+def as_record(data):
+    """Snapshot data into an instance of the class for its key set"""
+    return record_class(tuple(sorted(data)))(data)
+
+
+if __name__=="__main__":
+    data = {'foo': 3, 'bar': 'x'}
+    print("DictRecord shares the dict")
+    record = DictRecord(data)
+    print('foo:', record.foo)
+    data['foo'] = 4
+    print('foo after data["foo"] = 4:', record.foo)
+    print("")
+
+    print("record_class generates one class per key set")
+    record = as_record(data)
+    print(record)
+    print('same class for the same keys:',
+          type(record) is type(as_record({'bar': 'y', 'foo': 5})))
+    try:
+        record.baz = 1
+    except AttributeError:
+        print('AttributeError Expected: __slots__ fixes the key set')
+    print("")
+
+    count = 1000000
+    data = {'foo': 3, 'bar': 'x'}
+
+    class PlainObject(object):
+        def __init__(self):
+            self.foo = 3
+
+    print("%d attribute reads" % count)
+    for label, obj in (('plain object', PlainObject()),
+                       ('DictionaryDB', DictionaryDB(data)),
+                       ('DictRecord', DictRecord(dict(data))),
+                       ('record_class', as_record(data))):
+        start = time()
+        for _ in range(count):
+            obj.foo
+        end = time()
+        print('%-13s took %.3f seconds' % (label, end - start))
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+'''
+* Brett Slatkin, 2014, "effective Python"
+* Brett Slatkin's example code([GitHub](https://github.com/bslatkin/effectivepython))
+* I modified the example code a bit to confirm my understanding.
+* item32_lru.py is written in Python 3.6
+
+Lazy attributes with a memory budget
+* LazyDB and MissingPropertyDB setattr() every looked-up value into the
+  instance dict, so long-lived objects keep growing forever
+* keep lazily loaded values in a side cache instead of the instance dict:
+  every read goes through __getattr__, which can track recency
+* when the budget is exceeded, evict the least recently used values;
+  the next read reloads them through the same __getattr__ path
+'''
+from collections import OrderedDict
+from random import Random
+from time import time
+import sys
+
+
+class MemoryBudget(object):
+    """
+    An LRU of lazily loaded values, bounded by max_bytes.
+    One budget can be shared by many objects (a global budget)
+    or each object can have its own.
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+        # (id(cache), name) -> (cache, name, size), oldest first.
+        # Holding the cache dict (not its owner) lets owners be collected;
+        # their values are dropped as the budget evicts them.
+        self._lru = OrderedDict()
+
+    def __repr__(self):
+        return ('MemoryBudget(used_bytes=%d, hits=%d, loads=%d, '
+                'evictions=%d)' %
+                (self.used_bytes, self.hits, self.loads, self.evictions))
+
+    def touch(self, key):
+        self.hits += 1
+        self._lru.move_to_end(key)
+
+    def add(self, key, cache, name, size):
+        self.loads += 1
+        self._lru[key] = (cache, name, size)
+        self.used_bytes += size
+        # Always keep the value just loaded, even if it alone is too big
+        while self.used_bytes > self.max_bytes and len(self._lru) > 1:
+            _, (old_cache, old_name, old_size) = self._lru.popitem(last=False)
+            del old_cache[old_name]
+            self.used_bytes -= old_size
+            self.evictions += 1
+
+    def forget(self, key):
+        _, _, size = self._lru.pop(key)
+        self.used_bytes -= size
+
+
+class EvictingLazyDB(object):
+    """
+    Like MissingPropertyDB, but lazily loaded values are cached under
+    a memory budget: the class-wide budget, or a per-object one
+    if max_bytes is given.
+    """
+    budget = MemoryBudget(1 << 20)
+
+    def __init__(self, max_bytes=None):
+        self._cache = {}
+        if max_bytes is not None:
+            self.budget = MemoryBudget(max_bytes)
+
+    def load(self, name):
+        # if a dynamically accessed property should not exist,
+        # raise an AttributeError
+        if name == 'bad_name':
+            raise AttributeError('%s is missing' % name)
+        return 'Value for %s' % name
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        cache = self._cache
+        key = (id(cache), name)
+        if name in cache:
+            self.budget.touch(key)
+            return cache[name]
+        value = self.load(name)
+        cache[name] = value
+        self.budget.add(key, cache, name, sys.getsizeof(value))
+        return value
+
+    def _forget(self, name):
+        """Drop the cached value of name, if any; True if there was one"""
+        # _cache doesn't exist yet while __init__ assigns it
+        cache = self.__dict__.get('_cache')
+        if cache is None or name not in cache:
+            return False
+        del cache[name]
+        self.budget.forget((id(cache), name))
+        return True
+
+    def __setattr__(self, name, value):
+        # An explicit value shadows the cached one: stop budgeting it
+        self._forget(name)
+        super(EvictingLazyDB, self).__setattr__(name, value)
+
+    def __delattr__(self, name):
+        # An explicit value is what reads see, so delete that first
+        if name in self.__dict__:
+            super(EvictingLazyDB, self).__delattr__(name)
+        elif not self._forget(name):
+            super(EvictingLazyDB, self).__delattr__(name)
+
+
+class BigValueDB(EvictingLazyDB):
+    """Each lazily loaded value is 10 KB"""
+    def load(self, name):
+        return name.encode('utf-8') * (10240 // len(name))
+
+
+if __name__=="__main__":
+    data = EvictingLazyDB(max_bytes=1024)
+    print("Before: ", data.__dict__)
+    print("foo:    ", data.foo)
+    print("foo is not in the instance dict, it is in the budgeted cache")
+    print("After:  ", data.__dict__)
+    print("foo:    ", data.foo)
+    print(data.budget)
+    print("")
+
+    try:
+        data.bad_name
+    except AttributeError:
+        print("AttributeError Expected")
+    print("")
+
+    print("assigning foo replaces the cached value")
+    data.foo = 1
+    print("foo:    ", data.foo, data.budget)
+    del data.foo
+    print("foo:    ", data.foo)
+    print("")
+
+    print("a per-object budget of 30 KB holds about 2 values of 10 KB")
+    data = BigValueDB(max_bytes=30 * 1024)
+    for name in ('alpha', 'beta', 'alpha', 'gamma', 'alpha', 'beta'):
+        getattr(data, name)
+        print('read %-6s cached: %s' % (name, sorted(data._cache)))
+    print(data.budget)
+    print("")
+
+    print("a shared budget bounds the total size of many objects")
+    BigValueDB.budget = MemoryBudget(1 << 20)
+    objects = [BigValueDB() for _ in range(1000)]
+    # 80% of the reads go to 50 hot objects
+    rand = Random(1)
+    start = time()
+    for i in range(20000):
+        if rand.random() < 0.8:
+            data = objects[rand.randrange(50)]
+        else:
+            data = objects[rand.randrange(1000)]
+        getattr(data, 'field%d' % rand.randrange(2))
+    end = time()
+    print('Took %.3f seconds, %r' % (end - start, BigValueDB.budget))
+    assert BigValueDB.budget.used_bytes <= 1 << 20
@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+'''
+* Brett Slatkin, 2014, "effective Python"
+* Brett Slatkin's example code([GitHub](https://github.com/bslatkin/effectivepython))
+* I modified the example code a bit to confirm my understanding.
+* item32_recordview.py is written in Python 3.6
+
+Zero-copy attribute views over fixed-layout binary records
+* wrapping each record in a DictionaryDB means decoding every field
+  into a dict first, even the fields nobody reads
+* instead, map attribute names to offsets in a memoryview/mmap buffer
+  and decode a field only when its attribute is read
+* scan() moves one view along the buffer: no allocation per record
+'''
+from time import time
+import mmap
+import os
+import struct
+import tempfile
+
+from item32_fastdict import DictionaryDB
+
+
+class Field(object):
+    """Decodes one field of the record the view points at"""
+    def __init__(self, fmt, offset):
+        self.struct = struct.Struct('<' + fmt)
+        self.offset = offset
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value, = self.struct.unpack_from(
+            instance._buffer, instance._offset + self.offset)
+        return value
+
+
+class BytesField(Field):
+    """Fixed-width bytes, padded with NULs"""
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value, = self.struct.unpack_from(
+            instance._buffer, instance._offset + self.offset)
+        return value.rstrip(b'\0')
+
+
+class RecordView(object):
+    """Base class for views; subclasses are made by record_view_class()"""
+    __slots__ = ('_buffer', '_offset')
+    record_size = 0
+    field_names = ()
+
+    def __init__(self, buffer, offset=0):
+        self._buffer = buffer
+        self._offset = offset
+
+    def __repr__(self):
+        return '%s(%s)' % (type(self).__name__, ', '.join(
+            '%s=%r' % (name, getattr(self, name))
+            for name in self.field_names))
+
+    @classmethod
+    def count(cls, buffer):
+        return len(buffer) // cls.record_size
+
+    @classmethod
+    def at(cls, buffer, index):
+        return cls(buffer, index * cls.record_size)
+
+    @classmethod
+    def scan(cls, buffer):
+        """
+        Yield a view of each record in turn. The same view object is
+        moved along the buffer, so don't keep references to it.
+        """
+        view = cls(buffer)
+        size = cls.record_size
+        for offset in range(0, cls.count(buffer) * size, size):
+            view._offset = offset
+            yield view
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.field_names}
+
+
+# Names a field can't have: they would replace the class API
+RESERVED = frozenset(dir(RecordView)) | {'layout'}
+
+
+def record_view_class(name, fields):
+    """
+    fields: (name, struct format) pairs in layout order,
+    little-endian and without padding, e.g. [('id', 'q'), ('name', '8s')]
+    """
+    class_dict = {'__slots__': ()}
+    offset = 0
+    for field_name, fmt in fields:
+        if field_name in RESERVED or field_name.startswith('_'):
+            raise ValueError('%r would replace part of the RecordView API' %
+                             field_name)
+        field_class = BytesField if fmt.endswith('s') else Field
+        field = field_class(fmt, offset)
+        class_dict[field_name] = field
+        offset += field.struct.size
+    class_dict['record_size'] = offset
+    class_dict['field_names'] = tuple(field_name for field_name, _ in fields)
+    class_dict['layout'] = struct.Struct(
+        '<' + ''.join(fmt for _, fmt in fields))
+    return type(name, (RecordView,), class_dict)
+
+
+Trade = record_view_class('Trade', [
+    ('trade_id', 'q'),
+    ('symbol', '8s'),
+    ('price', 'd'),
+    ('quantity', 'i'),
+    ('flags', 'H'),
+])
+
+
+# The DictionaryDB way: decode the whole record into a dict first
+def decode_dict(buffer, offset):
+    values = Trade.layout.unpack_from(buffer, offset)
+    data = dict(zip(Trade.field_names, values))
+    data['symbol'] = data['symbol'].rstrip(b'\0')
+    return DictionaryDB(data)
+
+
+if __name__=="__main__":
+    count = 500000
+    path = os.path.join(tempfile.mkdtemp(), 'trades.bin')
+    with open(path, 'wb') as f:
+        for i in range(count):
+            f.write(Trade.layout.pack(
+                i, b'SYM%d' % (i % 100), 100.0 + i % 50, i % 1000, 0))
+    print('wrote %d records of %d bytes' % (count, Trade.record_size))
+
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(buffer)
+        print(Trade.at(view, 42))
+        print("")
+
+        print("scan: sum of quantity for one symbol")
+        start = time()
+        total = 0
+        for i in range(count):
+            record = decode_dict(view, i * Trade.record_size)
+            if record.symbol == b'SYM7':
+                total += record.quantity
+        end = time()
+        print('dict per record:  took %.3f seconds, total %d' %
+              (end - start, total))
+        expected = total
+
+        start = time()
+        total = 0
+        for record in Trade.scan(view):
+            if record.symbol == b'SYM7':
+                total += record.quantity
+        end = time()
+        print('RecordView.scan:  took %.3f seconds, total %d' %
+              (end - start, total))
+        assert total == expected
+        print("")
+
+        try:
+            record_view_class('Order', [('id', 'q'), ('count', 'i')])
+        except ValueError as e:
+            print('ValueError Expected:', e)
+
+        # Views must be released before the mmap can be closed
+        record = None
+        view.release()
+        buffer.close()
+    os.remove(path)
+    os.rmdir(os.path.dirname(path))
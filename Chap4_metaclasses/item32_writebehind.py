@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+'''
+* Brett Slatkin, 2014, "effective Python"
+* Brett Slatkin's example code([GitHub](https://github.com/bslatkin/effectivepython))
+* I modified the example code a bit to confirm my understanding.
+* item32_writebehind.py is written in Python 3.6
+
+Write-behind persistence for SavingDB
+* SavingDB.__setattr__ is meant to "save some data to the DB log"
+  on every assignment: synchronous I/O for each attribute write
+* instead, __setattr__ only marks (object, field) dirty in memory
+* repeated writes to the same field are coalesced: only the last value
+  is written
+* dirty fields are appended to a local log in batches, by a background
+  thread or at an explicit commit()
+'''
+from threading import Condition, Lock, Thread
+from time import time
+import json
+import os
+import shutil
+import tempfile
+
+# Durability options, weakest to strongest
+BUFFERED = 'buffered'  # leave it in Python's file buffer
+FLUSH = 'flush'        # hand it to the OS: survives a process crash
+FSYNC = 'fsync'        # force it to disk: survives a power failure
+
+
+class WriteBehindLog(object):
+    """An append-only JSON-lines log fed from a coalescing dirty set"""
+    def __init__(self, path, durability=FLUSH, interval=0.05,
+                 batch_size=10000, background=True):
+        if durability not in (BUFFERED, FLUSH, FSYNC):
+            raise ValueError('Unknown durability %r' % durability)
+        self.path = path
+        self.durability = durability
+        self.interval = interval
+        self.batch_size = batch_size
+        self.records_written = 0
+        self.assignments = 0
+        self._file = open(path, 'a')
+        self._dirty = {}              # (object_id, field) -> value
+        self._lock = Lock()           # guards _dirty
+        self._write_lock = Lock()     # one batch written at a time
+        self._wakeup = Condition(self._lock)
+        self._closed = False
+        self._error = None
+        self._thread = None
+        if background:
+            self._thread = Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def record(self, object_id, name, value):
+        with self._lock:
+            if self._closed:
+                raise ValueError('log is closed')
+            self._dirty[(object_id, name)] = value
+            self.assignments += 1
+            if len(self._dirty) >= self.batch_size:
+                self._wakeup.notify()
+
+    def _write(self):
+        # Swapping and writing under one lock keeps the batches in order:
+        # a newer value can't be written before an older one
+        with self._write_lock:
+            with self._lock:
+                batch, self._dirty = self._dirty, {}
+            lines = []
+            error = None
+            for (object_id, name), value in batch.items():
+                try:
+                    lines.append(json.dumps([object_id, name, value]) + '\n')
+                except (TypeError, ValueError) as e:
+                    # Skip it, but don't lose the rest of the batch
+                    error = TypeError('%r.%s not saved: %s' %
+                                      (object_id, name, e))
+            if lines:
+                self._file.write(''.join(lines))
+                self.records_written += len(lines)
+            if self.durability in (FLUSH, FSYNC):
+                self._file.flush()
+            if self.durability == FSYNC:
+                os.fsync(self._file.fileno())
+            if error is not None:
+                raise error
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def commit(self):
+        """
+        Write every dirty field now, honoring the durability option.
+        Also raises an error hit by an earlier background write.
+        """
+        self._write()
+        self._raise_error()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._closed:
+                    self._wakeup.wait(self.interval)
+                closed = self._closed
+            try:
+                self._write()
+            except Exception as e:
+                # Reported by the next commit() or close()
+                self._error = e
+            if closed:
+                return
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._wakeup.notify()
+        try:
+            if self._thread is not None:
+                self._thread.join()
+                self._raise_error()
+            else:
+                self.commit()
+        finally:
+            self._file.close()
+
+
+def replay(path):
+    """Rebuild the latest saved fields of every object from the log"""
+    objects = {}
+    with open(path) as f:
+        for line in f:
+            object_id, name, value = json.loads(line)
+            objects.setdefault(object_id, {})[name] = value
+    return objects
+
+
+class WriteBehindSavingDB(object):
+    def __init__(self, log, object_id):
+        # Private names are bookkeeping, not saved
+        self._log = log
+        self._object_id = object_id
+
+    def __setattr__(self, name, value):
+        # Save some data to the DB log, later
+        super(WriteBehindSavingDB, self).__setattr__(name, value)
+        if not name.startswith('_'):
+            self._log.record(self._object_id, name, value)
+
+
+class SyncSavingDB(object):
+    """The synchronous version: one log write per assignment"""
+    def __init__(self, log_file, object_id):
+        self._log_file = log_file
+        self._object_id = object_id
+
+    def __setattr__(self, name, value):
+        super(SyncSavingDB, self).__setattr__(name, value)
+        if not name.startswith('_'):
+            self._log_file.write(
+                json.dumps([self._object_id, name, value]) + '\n')
+            self._log_file.flush()
+
+
+if __name__=="__main__":
+    workdir = tempfile.mkdtemp()
+
+    print("assignments are coalesced per object and field")
+    path = os.path.join(workdir, 'demo.log')
+    log = WriteBehindLog(path, background=False)
+    data = WriteBehindSavingDB(log, 'user-1')
+    data.foo = 5
+    data.foo = 7
+    data.bar = 'x'
+    log.commit()
+    print('assignments: %d, records written: %d' %
+          (log.assignments, log.records_written))
+    print('replayed:', replay(path))
+    log.close()
+    print("")
+
+    print("a write error in the background thread is raised by close()")
+    path = os.path.join(workdir, 'error.log')
+    log = WriteBehindLog(path)
+    data = WriteBehindSavingDB(log, 'user-2')
+    data.foo = object()
+    data.bar = 'x'
+    try:
+        log.close()
+    except TypeError as e:
+        print('TypeError Expected:', e)
+    print('replayed:', replay(path))
+    print("")
+
+    count = 200000
+    print("throughput for %d assignments to 100 objects x 10 fields" % count)
+    path = os.path.join(workdir, 'sync.log')
+    with open(path, 'a') as log_file:
+        objects = [SyncSavingDB(log_file, i) for i in range(100)]
+        start = time()
+        for i in range(count):
+            setattr(objects[i % 100], 'field%d' % (i // 100 % 10), i)
+        end = time()
+    print('SyncSavingDB:                %9.0f assignments per second' %
+          (count / (end - start)))
+
+    for durability in (BUFFERED, FLUSH, FSYNC):
+        path = os.path.join(workdir, durability + '.log')
+        log = WriteBehindLog(path, durability=durability)
+        objects = [WriteBehindSavingDB(log, i) for i in range(100)]
+        start = time()
+        for i in range(count):
+            setattr(objects[i % 100], 'field%d' % (i // 100 % 10), i)
+        log.close()
+        end = time()
+        assert replay(path) == replay(os.path.join(workdir, 'sync.log'))
+        print('WriteBehindSavingDB(%-8s) %9.0f assignments per second, '
+              '%d records written' %
+              (durability, count / (end - start), log.records_written))
+    shutil.rmtree(workdir)
@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+'''
+* Brett Slatkin, 2014, "effective Python"
+* Brett Slatkin's example code([GitHub](https://github.com/bslatkin/effectivepython))
+* I modified the example code a bit to confirm my understanding.
+* item33_lazy.py is written in Python 3.6
+
+Deferring class validation until a class is first used
+* ValidatePolygon.__new__ validates every subclass at import time,
+  even classes that are never used
+* instead, the metaclass creates the class with a pending metaclass and
+  does nothing else
+* the checks run the first time the class is instantiated or a
+  classmethod like interior_angles is called
+* then the class is switched back to the plain metaclass, so validated
+  classes pay nothing extra afterwards
+* set LazyValidatePolygon.eager = True (or call validate_all())
+  to validate everything up front, e.g. in tests; validate_all()
+  reports every invalid class, not just the first
+* the sides check is cheap, so deferring it saves little when a class is
+  defined: the saving grows with the cost of the checks
+'''
+from time import perf_counter
+
+
+def check_polygon(cls):
+    # Read sides through the MRO: subclasses may inherit it. type's own
+    # __getattribute__ doesn't trigger validation again
+    sides = type.__getattribute__(cls, 'sides')
+    if sides is None or sides < 3:
+        raise ValueError('Polygons need 3+ sides')
+
+
+class LazyValidatePolygon(type):
+    eager = False
+
+    def __new__(meta, name, bases, class_dict):
+        # Don't validate the abstract Polygon class
+        if bases == (object,):
+            return type.__new__(meta, name, bases, class_dict)
+        if LazyValidatePolygon.eager:
+            # Bases still pending are validated first. meta is the
+            # metaclass type.__new__ picks anyway: asking for
+            # LazyValidatePolygon under a pending base would call back
+            # into this __new__ through PendingPolygon
+            for base in bases:
+                validate(base)
+            cls = type.__new__(meta, name, bases, class_dict)
+            check_polygon(cls)
+            cls.__class__ = LazyValidatePolygon
+            return cls
+        # Created with the pending metaclass: nothing else to do until
+        # the class is used
+        return type.__new__(PendingPolygon, name, bases, class_dict)
+
+
+class PendingPolygon(LazyValidatePolygon):
+    """Metaclass of subclasses that haven't been validated yet"""
+    # Class attributes that trigger validation
+    validate_on = frozenset(['interior_angles'])
+
+    def __call__(cls, *args, **kwargs):
+        validate(cls)
+        return type.__call__(cls, *args, **kwargs)
+
+    def __getattribute__(cls, name):
+        if name in PendingPolygon.validate_on:
+            validate(cls)
+        return type.__getattribute__(cls, name)
+
+
+def validate(cls):
+    """Run the pending checks for cls; a failing class stays pending"""
+    if type(cls) is not PendingPolygon:
+        return
+    check_polygon(cls)
+    cls.__class__ = LazyValidatePolygon
+
+
+def pending():
+    """The subclasses of Polygon that haven't been validated yet"""
+    result = []
+    classes = [Polygon]
+    while classes:
+        cls = classes.pop()
+        if type(cls) is PendingPolygon:
+            result.append(cls)
+        classes.extend(type.__subclasses__(cls))
+    return result
+
+
+def validate_all():
+    """Validate every pending class, then report all the failures at once"""
+    failures = []
+    for cls in pending():
+        try:
+            validate(cls)
+        except ValueError as e:
+            failures.append('%s: %s' % (cls.__name__, e))
+    if failures:
+        raise ValueError('%d invalid polygons\n%s' %
+                         (len(failures), '\n'.join(sorted(failures))))
+
+
+class Polygon(object, metaclass=LazyValidatePolygon):
+    sides = None  # Specified by subclasses
+
+    @classmethod
+    def interior_angles(cls):
+        return (cls.sides - 2) * 180
+
+
+class Triangle(Polygon):
+    sides = 3
+
+
+class Line(Polygon):
+    sides = 1
+
+
+def define_classes(count):
+    return [LazyValidatePolygon('Shape%d' % i, (Polygon,), {'sides': 3 + i})
+            for i in range(count)]
+
+
+if __name__=="__main__":
+    print("Line was defined without an error")
+    print('pending:', sorted(cls.__name__ for cls in pending()))
+    print(Triangle.interior_angles())
+    print('pending:', sorted(cls.__name__ for cls in pending()))
+    print('Triangle metaclass:', type(Triangle).__name__)
+    try:
+        Line()
+    except ValueError:
+        print('ValueError Expected on first use of Line')
+    try:
+        Line.interior_angles()
+    except ValueError:
+        print('ValueError Expected again: Line stays pending')
+    print(" ")
+
+    print("validate_all() checks everything, e.g. in tests")
+    class Point(Polygon):
+        sides = 0
+    try:
+        validate_all()
+    except ValueError as e:
+        print('ValueError Expected:', e)
+
+    class EquilateralTriangle(Triangle):
+        pass  # sides is inherited
+    print(EquilateralTriangle.interior_angles())
+
+
+    class Square(Polygon):
+        sides = 4
+
+        def __init__(self, size):
+            self.size = size
+
+        def __repr__(self):
+            return 'Square(%d)' % self.size
+    print(Square(2))
+
+    class Hexagon(Polygon):
+        sides = 6
+
+    LazyValidatePolygon.eager = True
+    try:
+        class Pentagon(Line):  # Line is still pending, and invalid
+            sides = 5
+    except ValueError:
+        print('ValueError Expected: eager mode checks pending bases')
+
+    class BigHexagon(Hexagon):  # Hexagon is still pending, and valid
+        pass
+    print('Hexagon metaclass:', type(Hexagon).__name__)
+    print('BigHexagon metaclass:', type(BigHexagon).__name__)
+    LazyValidatePolygon.eager = False
+    print(" ")
+
+    count = 5000
+    print("defining %d subclasses" % count)
+    start = perf_counter()
+    classes = define_classes(count)
+    end = perf_counter()
+    print('lazy:  took %.3f seconds' % (end - start))
+
+    LazyValidatePolygon.eager = True
+    start = perf_counter()
+    define_classes(count)
+    end = perf_counter()
+    LazyValidatePolygon.eager = False
+    print('eager: took %.3f seconds' % (end - start))
+
+    start = perf_counter()
+    for cls in classes[:count // 10]:
+        cls()
+    end = perf_counter()
+    print('using 10%% of the lazy classes: took %.3f seconds' % (end - start))
+    print(" ")
+
+    print("instantiating a class once it has been validated")
+    Triangle()
+    start = perf_counter()
+    for _ in range(100000):
+        Triangle()
+    end = perf_counter()
+    print('validated class:  took %.3f seconds' % (end - start))
+
+    class PlainTriangle(object):
+        sides = 3
+
+    start = perf_counter()
+    for _ in range(100000):
+        PlainTriangle()
+    end = perf_counter()
+    print('plain class:      took %.3f seconds' % (end - start))
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+'''
+* Brett Slatkin, 2014, "effective Python"
+* Brett Slatkin's example code([GitHub](https://github.com/bslatkin/effectivepython))
+* I modified the example code a bit to confirm my understanding.
+* item33_py3.py is written in Python 3.6
+
+Validate subclasses with Metaclasses, the Python 3 way
+* Python 3 ignores the __metaclass__ class attribute used in item33,
+  so ValidatePolygon never runs there: the metaclass goes in the
+  class statement, class Polygon(object, metaclass=ValidatePolygon)
+* Python 3.6+ also has __init_subclass__, which validates subclasses
+  without a metaclass at all
+* Meta no longer prints the full class dict when a class is created
+* how much does validation add to import time? run the benchmark below
+'''
+from time import perf_counter
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+
+class Meta(type):
+    verbose = False
+
+    def __new__(meta, name, bases, class_dict):
+        if meta.verbose:
+            print((meta, name, bases, class_dict))
+        return type.__new__(meta, name, bases, class_dict)
+
+
+class MyClass(object, metaclass=Meta):
+    stuff = 123
+
+    def foo(self):
+        pass
+
+
+class ValidatePolygon(type):
+    def __new__(meta, name, bases, class_dict):
+        cls = type.__new__(meta, name, bases, class_dict)
+        # Don't validate the abstract Polygon class. Read sides from the
+        # class, not class_dict, so an inherited value counts too
+        if bases != (object,):
+            sides = getattr(cls, 'sides', None)
+            if sides is None or sides < 3:
+                raise ValueError('Polygons need 3+ sides')
+        return cls
+
+
+class Polygon(object, metaclass=ValidatePolygon):
+    sides = None  # Specified by subclasses
+
+    @classmethod
+    def interior_angles(cls):
+        return (cls.sides - 2) * 180
+
+
+# The same validation without a metaclass
+class SubclassPolygon(object):
+    sides = None  # Specified by subclasses
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.sides is None or cls.sides < 3:
+            raise ValueError('Polygons need 3+ sides')
+
+    @classmethod
+    def interior_angles(cls):
+        return (cls.sides - 2) * 180
+
+
+class PlainPolygon(object):
+    """No validation at all, as the baseline"""
+    sides = None
+
+    @classmethod
+    def interior_angles(cls):
+        return (cls.sides - 2) * 180
+
+
+class Triangle(Polygon):
+    sides = 3
+
+
+BASES = ('PlainPolygon', 'Polygon', 'SubclassPolygon')
+
+
+def generated_module(base, count):
+    """Source code of a module defining count subclasses of base"""
+    lines = ['from item33_py3 import %s' % base]
+    for i in range(count):
+        lines.append('class Shape%d(%s):' % (i, base))
+        lines.append('    sides = %d' % (3 + i % 10))
+        lines.append('    def area(self):')
+        lines.append('        return %d' % i)
+    return '\n'.join(lines) + '\n'
+
+
+def time_class_creation(base, count, repeat=5):
+    """Best time to run (not compile) the class statements of a module"""
+    code = compile(generated_module(base, count), '<generated>', 'exec')
+    best = None
+    for _ in range(repeat):
+        start = perf_counter()
+        exec(code, {'__name__': 'generated'})
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def time_import(base, count, workdir):
+    """Wall time to import a generated module in a fresh interpreter"""
+    name = 'shapes_%s_%d' % (base.lower(), count)
+    with open(os.path.join(workdir, name + '.py'), 'w') as f:
+        f.write(generated_module(base, count))
+    # Compile once so every measurement imports from bytecode
+    subprocess.check_call([sys.executable, '-c', 'import ' + name],
+                          cwd=workdir, env=benchmark_env(workdir))
+    out = subprocess.check_output(
+        [sys.executable, '-c',
+         'from time import perf_counter; start = perf_counter(); '
+         'import %s; print(perf_counter() - start)' % name],
+        cwd=workdir, env=benchmark_env(workdir))
+    return float(out)
+
+
+def benchmark_env(workdir):
+    env = os.environ.copy()
+    here = os.path.dirname(os.path.abspath(__file__))
+    env['PYTHONPATH'] = os.pathsep.join([workdir, here])
+    return env
+
+
+if __name__=="__main__":
+    print(Triangle.interior_angles())
+    print(" ")
+
+    print("the metaclass really runs on Python 3 now")
+    try:
+        class Line(Polygon):
+            sides = 1
+    except ValueError:
+        print('ValueError Expected')
+    try:
+        class SubclassLine(SubclassPolygon):
+            sides = 1
+    except ValueError:
+        print('ValueError Expected (__init_subclass__)')
+
+    class EquilateralTriangle(Triangle):
+        pass  # sides is inherited
+    print(EquilateralTriangle.interior_angles())
+    print(" ")
+
+    print("class creation cost, best of 5 runs")
+    for count in (1000, 5000):
+        for base in BASES:
+            elapsed = time_class_creation(base, count)
+            print('%5d subclasses of %-15s took %.3f seconds '
+                  '(%.1f us per class)' %
+                  (count, base, elapsed, elapsed / count * 1e6))
+    print(" ")
+
+    print("import time in a fresh interpreter, from bytecode")
+    workdir = tempfile.mkdtemp()
+    for base in BASES:
+        elapsed = time_import(base, 5000, workdir)
+        print('5000 subclasses of %-15s took %.3f seconds' % (base, elapsed))
+    shutil.rmtree(workdir)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+'''
+* Brett Slatkin, 2014, "effective Python"
+* Brett Slatkin's example code([GitHub](https://github.com/bslatkin/effectivepython))
+* I modified the example code a bit to confirm my understanding.
+* item33_registry.py is written in Python 3.6
+
+A class registry with precomputed validation and dispatch tables
+* ValidatePolygon only checks sides when a class is defined
+* since the metaclass runs once per class definition anyway, it can also:
+    (1) record every subclass in a registry by name
+    (2) check that required attributes are overridden
+    (3) precompute per-class tables: classmethod results
+        like interior_angles() and a map of method names to functions
+* at runtime, lookup by name or type is one dict read,
+  instead of walking __subclasses__() or calling getattr()
+'''
+from time import time
+
+
+class RegistryMeta(type):
+    def __new__(meta, name, bases, class_dict):
+        cls = type.__new__(meta, name, bases, class_dict)
+        if not any(isinstance(base, RegistryMeta) for base in bases):
+            # Don't validate the abstract root class; it owns the registry
+            cls._root = cls
+            cls._registry = {}
+            return cls
+
+        root = cls._root
+        for attr in root.required_overrides:
+            if not any(attr in vars(klass)
+                       for klass in cls.__mro__ if klass is not root):
+                raise TypeError('%s must override %s' % (name, attr))
+        cls.validate_class()
+        if name in root._registry:
+            raise ValueError('%s is already registered' % name)
+
+        cls._values = {attr: getattr(cls, attr)()
+                       for attr in root.precompute}
+        cls._methods = {}
+        for attr in dir(cls):
+            if not attr.startswith('_'):
+                value = getattr(cls, attr)
+                if callable(value):
+                    cls._methods[attr] = value
+        root._registry[name] = cls
+        return cls
+
+    def lookup(cls, name):
+        """The registered class called name (KeyError if there is none)"""
+        return cls._registry[name]
+
+    def value(cls, attr):
+        """A precomputed classmethod result"""
+        return cls._values[attr]
+
+    def method(cls, attr):
+        """Dispatch table read: the function bound to attr for this class"""
+        return cls._methods[attr]
+
+    def registered(cls):
+        return list(cls._registry.values())
+
+
+class Polygon(object, metaclass=RegistryMeta):
+    sides = None  # Specified by subclasses
+    required_overrides = ('sides',)
+    precompute = ('interior_angles',)
+
+    @classmethod
+    def validate_class(cls):
+        if cls.sides < 3:
+            raise ValueError('Polygons need 3+ sides')
+
+    @classmethod
+    def interior_angles(cls):
+        return (cls.sides - 2) * 180
+
+    def describe(self):
+        return '%s with %d sides' % (type(self).__name__, self.sides)
+
+
+class Triangle(Polygon):
+    sides = 3
+
+
+class Square(Polygon):
+    sides = 4
+
+    def describe(self):
+        return 'a square'
+
+
+def find_by_reflection(root, name):
+    """The alternative without a registry: walk the class tree"""
+    pending = list(root.__subclasses__())
+    while pending:
+        klass = pending.pop()
+        if klass.__name__ == name:
+            return klass
+        pending.extend(klass.__subclasses__())
+    raise KeyError(name)
+
+
+if __name__=="__main__":
+    print(Triangle.interior_angles())
+    print(Polygon.lookup('Square').value('interior_angles'))
+    print(Polygon.lookup('Square').method('describe')(Square()))
+    print("")
+
+    print("validation still happens at class definition")
+    try:
+        class Line(Polygon):
+            sides = 1
+    except ValueError as e:
+        print('ValueError Expected:', e)
+    try:
+        class Blob(Polygon):
+            pass
+    except TypeError as e:
+        print('TypeError Expected:', e)
+    print("")
+
+    print("defining 500 plugin classes")
+    start = time()
+    for i in range(500):
+        RegistryMeta('Plugin%d' % i, (Polygon,), {'sides': 3 + i})
+    end = time()
+    print('Took %.3f seconds' % (end - start))
+    print('%d classes registered' % len(Polygon.registered()))
+    print("")
+
+    count = 10000
+    print("%d lookups by name + interior_angles" % count)
+    start = time()
+    for _ in range(count):
+        find_by_reflection(Polygon, 'Plugin250').interior_angles()
+    end = time()
+    print('reflection: took %.3f seconds' % (end - start))
+    start = time()
+    for _ in range(count):
+        Polygon.lookup('Plugin250').value('interior_angles')
+    end = time()
+    print('registry:   took %.3f seconds' % (end - start))
@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+'''
+* Brett Slatkin, 2014, "effective Python"
+* Brett Slatkin's example code([GitHub](https://github.com/bslatkin/effectivepython))
+* I modified the example code a bit to confirm my understanding.
+* item36_accounting.py is written in Python 3.9
+
+Per-child resource accounting for subprocess jobs
+* which children eat CPU or memory? the parent can't tell from Popen
+* os.wait4() reaps a child and returns its resource usage (rusage):
+  user/sys CPU seconds and max RSS, for that child only
+* AccountedPopen reaps with wait4 instead of waitpid through its public
+  poll()/wait(), and counts the bytes the parent pipes in and reads out
+* JobSummary aggregates the numbers per command, to size a process
+  pool from data
+'''
+from time import sleep, time
+import os
+import shutil
+import subprocess
+import sys
+
+
+class AccountedPopen(subprocess.Popen):
+    def __init__(self, *args, **kwargs):
+        self.started = time()
+        self.wall_time = None
+        self.rusage = None
+        self.bytes_in = 0
+        self.bytes_out = 0
+        super(AccountedPopen, self).__init__(*args, **kwargs)
+
+    def reap(self, block=True):
+        """
+        Reap the child with os.wait4 instead of waitpid, recording its
+        rusage. Returns the returncode, or None if block is False and the
+        child is still running.
+        """
+        if self.returncode is not None:
+            return self.returncode
+        try:
+            pid, status, rusage = os.wait4(
+                self.pid, 0 if block else os.WNOHANG)
+        except ChildProcessError:
+            # This happens if SIGCLD is set to be ignored
+            self.returncode = 0
+            return self.returncode
+        if pid == 0:
+            return None  # Still running
+        self.wall_time = time() - self.started
+        self.rusage = rusage
+        self.returncode = os.waitstatus_to_exitcode(status)
+        return self.returncode
+
+    def poll(self):
+        return self.reap(block=False)
+
+    def wait(self, timeout=None):
+        # Also used by communicate() and the with statement
+        if timeout is None:
+            return self.reap()
+        # wait4 has no timeout: poll until the deadline
+        deadline = time() + timeout
+        while self.reap(block=False) is None:
+            if time() >= deadline:
+                raise subprocess.TimeoutExpired(self.args, timeout)
+            sleep(0.001)
+        return self.returncode
+
+    def feed(self, data):
+        """Write to the child's stdin, counting bytes"""
+        self.stdin.write(data)
+        self.stdin.flush()  # Ensure the child gets input
+        self.bytes_in += len(data)
+
+    def read(self, size=-1):
+        """
+        Read from the child's stdout, counting bytes. Only feed(), read()
+        and communicate() are counted, not direct use of stdin/stdout.
+        """
+        data = self.stdout.read(size)
+        self.bytes_out += len(data)
+        return data
+
+    def communicate(self, input=None, timeout=None):
+        out, err = super(AccountedPopen, self).communicate(input, timeout)
+        if input:
+            self.bytes_in += len(input)
+        self.bytes_out += len(out or b'') + len(err or b'')
+        return out, err
+
+    @property
+    def user_time(self):
+        return self.rusage.ru_utime if self.rusage else 0.0
+
+    @property
+    def system_time(self):
+        return self.rusage.ru_stime if self.rusage else 0.0
+
+    @property
+    def max_rss(self):
+        """Peak resident set size in bytes"""
+        if not self.rusage:
+            return 0
+        # ru_maxrss is in kilobytes on Linux but in bytes on macOS
+        scale = 1 if sys.platform == 'darwin' else 1024
+        return self.rusage.ru_maxrss * scale
+
+
+class JobSummary(object):
+    def __init__(self):
+        self.procs = []
+
+    def add(self, proc):
+        self.procs.append(proc)
+
+    def by_command(self):
+        groups = {}
+        for proc in self.procs:
+            groups.setdefault(os.path.basename(proc.args[0]), []).append(proc)
+        return groups
+
+    def __str__(self):
+        lines = ['%-10s %5s %9s %9s %9s %10s %12s %12s' %
+                 ('command', 'runs', 'wall s', 'user s', 'sys s',
+                  'max RSS MB', 'bytes in', 'bytes out')]
+        groups = self.by_command()
+        groups['TOTAL'] = self.procs
+        for name, procs in groups.items():
+            lines.append('%-10s %5d %9.3f %9.3f %9.3f %10.1f %12d %12d' % (
+                name, len(procs),
+                sum(proc.wall_time or 0 for proc in procs),
+                sum(proc.user_time for proc in procs),
+                sum(proc.system_time for proc in procs),
+                max((proc.max_rss for proc in procs), default=0) / 1e6,
+                sum(proc.bytes_in for proc in procs),
+                sum(proc.bytes_out for proc in procs)))
+        return '\n'.join(lines)
+
+
+# The item36 helpers, instrumented
+def run_sleep(period):
+    return AccountedPopen(['sleep', str(period)])
+
+
+def run_openssl(data):
+    env = os.environ.copy()
+    env['password'] = 'e24U\nQl3S'
+    proc = AccountedPopen(
+        ['openssl', 'enc', '-des3', '-pbkdf2', '-pass', 'env:password'],
+        env=env,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE)
+    proc.feed(data)
+    return proc
+
+
+def run_md5(input_stdin):
+    """
+    input_stdin is another child's stdout: the bytes flow directly between
+    the children, so the parent only sees the bytes md5 writes out
+    """
+    proc = AccountedPopen(
+        ['md5' if shutil.which('md5') else 'md5sum'],
+        stdin=input_stdin,
+        stdout=subprocess.PIPE)
+    return proc
+
+
+def run_python_allocating(megabytes):
+    """A child that uses a known amount of memory and CPU"""
+    return AccountedPopen(
+        [sys.executable, '-c',
+         'data = bytearray(%d * 1024 * 1024); '
+         'sum(range(3000000))' % megabytes])
+
+
+if __name__=="__main__":
+    summary = JobSummary()
+
+    # item36's polling loop reaps through poll(), not wait()
+    procs = [run_sleep(0.1) for _ in range(5)]
+    for proc in procs:
+        while proc.poll() is None:
+            sleep(0.01)  # Some other work here
+        summary.add(proc)
+
+    input_procs = []
+    hash_procs = []
+    for _ in range(3):
+        # Small payloads only: openssl can't write out before md5 starts
+        proc = run_openssl(os.urandom(10))
+        input_procs.append(proc)
+        hash_procs.append(run_md5(proc.stdout))
+    for proc in input_procs:
+        proc.stdin.close()
+        proc.wait()
+        summary.add(proc)
+    for proc in hash_procs:
+        proc.read()
+        proc.wait()
+        summary.add(proc)
+
+    # communicate() handles large payloads without deadlocking
+    env = os.environ.copy()
+    env['password'] = 'e24U\nQl3S'
+    for _ in range(3):
+        proc = AccountedPopen(
+            ['openssl', 'enc', '-des3', '-pbkdf2', '-pass', 'env:password'],
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE)
+        proc.communicate(os.urandom(4 * 1024 * 1024))
+        summary.add(proc)
+
+    for megabytes in (10, 50, 100):
+        proc = run_python_allocating(megabytes)
+        proc.communicate()
+        summary.add(proc)
+
+    print(summary)
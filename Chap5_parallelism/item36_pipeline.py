@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+'''
+* Brett Slatkin, 2014, "effective Python"
+* Brett Slatkin's example code([GitHub](https://github.com/bslatkin/effectivepython))
+* I modified the example code a bit to confirm my understanding.
+* item36_pipeline.py is written in Python 3.6
+
+Streaming data through chains of child processes
+* item36 writes all of the input up front with proc.stdin.write(data)
+  and collects the output with communicate(): with large inputs the
+  pipes fill up and everything deadlocks, or all of it is buffered
+* instead, move data between the stages in chunks, with one selector
+  watching every pipe at once
+* each edge of the pipeline has a bounded buffer: when it is full, the
+  upstream stage is simply not read from, so its pipe fills up and the
+  kernel blocks it (backpressure)
+* the parent sees every byte, so it can report bytes per second per stage
+'''
+from time import time
+import hashlib
+import os
+import selectors
+import shutil
+import signal
+import subprocess
+
+CHUNK_SIZE = 1 << 16
+
+
+class StageStats(object):
+    def __init__(self, command):
+        self.command = command
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.start = time()
+        self.end = None
+        self.returncode = None
+
+    def __repr__(self):
+        elapsed = (self.end or time()) - self.start
+        return ('%-12s in %10d bytes, out %10d bytes, %8.1f MB/s, exit %s' %
+                (self.command[0], self.bytes_in, self.bytes_out,
+                 self.bytes_in / elapsed / 1e6 if elapsed else 0,
+                 self.returncode))
+
+
+class Pipeline(object):
+    """
+    Pipeline(['openssl', ...], ['md5sum']).run(chunks, sink)
+    streams an iterable of bytes through every stage and passes
+    the output of the last stage to sink() in chunks.
+
+    A stage may exit before reading all of its input (head, false): the
+    rest of its input is dropped. With check=True, a stage that exits
+    with an error raises CalledProcessError once the pipeline is done;
+    stages killed by SIGPIPE because a later stage stopped reading, like
+    in a shell pipeline, are not errors.
+    """
+    def __init__(self, *commands, buffer_size=4 * CHUNK_SIZE, env=None):
+        self.commands = commands
+        self.buffer_size = buffer_size
+        self.env = env
+
+    def run(self, chunks, sink, check=True):
+        procs = [subprocess.Popen(command, stdin=subprocess.PIPE,
+                                  stdout=subprocess.PIPE, env=self.env)
+                 for command in self.commands]
+        stats = [StageStats(command) for command in self.commands]
+        # buffers[i] holds bytes waiting to be written to stage i
+        buffers = [bytearray() for _ in procs]
+        upstream_done = [False] * len(procs)
+        for proc in procs:
+            os.set_blocking(proc.stdin.fileno(), False)
+            os.set_blocking(proc.stdout.fileno(), False)
+
+        source = iter(chunks)
+        selector = selectors.DefaultSelector()
+        registered = {}
+        try:
+            while True:
+                # Pull from the source only while the first buffer has room
+                while (not upstream_done[0] and
+                       len(buffers[0]) < self.buffer_size):
+                    chunk = next(source, None)
+                    if chunk is None:
+                        upstream_done[0] = True
+                    else:
+                        buffers[0] += chunk
+
+                wanted = {}
+                for i, proc in enumerate(procs):
+                    if proc.stdin.closed:
+                        pass
+                    elif buffers[i]:
+                        wanted[proc.stdin.fileno()] = (
+                            selectors.EVENT_WRITE, 'write', i)
+                    elif upstream_done[i]:
+                        proc.stdin.close()  # EOF for stage i
+                    if proc.stdout.closed:
+                        continue
+                    last = i + 1 == len(procs)
+                    if last or len(buffers[i + 1]) < self.buffer_size:
+                        wanted[proc.stdout.fileno()] = (
+                            selectors.EVENT_READ, 'read', i)
+                if not wanted:
+                    break
+                self._update(selector, registered, wanted)
+
+                for key, _ in selector.select():
+                    _, action, i = key.data
+                    if action == 'write':
+                        try:
+                            written = os.write(key.fd,
+                                               buffers[i][:CHUNK_SIZE])
+                        except BrokenPipeError:
+                            # Stage i stopped reading: drop its input
+                            selector.unregister(key.fd)
+                            del registered[key.fd]
+                            procs[i].stdin.close()
+                            buffers[i].clear()
+                            upstream_done[i] = True
+                            continue
+                        del buffers[i][:written]
+                        stats[i].bytes_in += written
+                        continue
+                    data = os.read(key.fd, CHUNK_SIZE)
+                    if not data:
+                        # Stage i is finished with its output
+                        selector.unregister(key.fd)
+                        del registered[key.fd]
+                        procs[i].stdout.close()
+                        stats[i].end = time()
+                        if i + 1 < len(procs):
+                            upstream_done[i + 1] = True
+                        continue
+                    stats[i].bytes_out += len(data)
+                    if i + 1 < len(procs):
+                        if not procs[i + 1].stdin.closed:
+                            buffers[i + 1] += data
+                    else:
+                        sink(data)
+        finally:
+            selector.close()
+            for proc in procs:
+                for stream in (proc.stdin, proc.stdout):
+                    if not stream.closed:
+                        stream.close()
+                proc.wait()
+            for proc, stage in zip(procs, stats):
+                stage.returncode = proc.returncode
+        if check:
+            for stage in stats:
+                if stage.returncode not in (0, -signal.SIGPIPE):
+                    raise subprocess.CalledProcessError(
+                        stage.returncode, stage.command)
+        return stats
+
+    @staticmethod
+    def _update(selector, registered, wanted):
+        for fd in list(registered):
+            if fd not in wanted:
+                selector.unregister(fd)
+                del registered[fd]
+        for fd, (events, action, i) in wanted.items():
+            if fd not in registered:
+                selector.register(fd, events, (events, action, i))
+            elif registered[fd] != (events, action, i):
+                selector.modify(fd, events, (events, action, i))
+            registered[fd] = (events, action, i)
+
+
+def generate_input(total, chunk=os.urandom(CHUNK_SIZE)):
+    """total bytes of input, produced lazily"""
+    for _ in range(total // len(chunk)):
+        yield chunk
+
+
+if __name__=="__main__":
+    md5 = ['md5'] if shutil.which('md5') else ['md5sum']
+    env = os.environ.copy()
+    env['password'] = 'e24U\nQl3S'
+    openssl = ['openssl', 'enc', '-des3', '-pbkdf2', '-pass', 'env:password']
+
+    total = 16 * 1024 * 1024
+    print("streaming %d MB through openssl | gzip | %s" %
+          (total >> 20, md5[0]))
+    output = []
+    start = time()
+    stats = Pipeline(openssl, ['gzip', '-1'], md5, env=env).run(
+        generate_input(total), output.append)
+    end = time()
+    print('output:', b''.join(output).split()[0])
+    for stage in stats:
+        print(stage)
+    print('Took %.3f seconds, %.1f MB/s end to end' %
+          (end - start, total / (end - start) / 1e6))
+    print("")
+
+    print("cat | %s gives the same digest as hashlib" % md5[0])
+    chunks = list(generate_input(total))
+    output = []
+    Pipeline(['cat'], md5).run(chunks, output.append)
+    digest = b''.join(output).split()[0].decode('ascii')
+    assert digest == hashlib.md5(b''.join(chunks)).hexdigest()
+    print(digest)
+    print("")
+
+    print("a stage that stops reading early: head -c 10 | cat")
+    output = []
+    stats = Pipeline(['head', '-c', '10'], ['cat']).run(
+        generate_input(total), output.append)
+    print('output: %d bytes' % len(b''.join(output)))
+    for stage in stats:
+        print(stage)
+    print("")
+
+    print("a failing stage is reported")
+    try:
+        Pipeline(['false'], ['cat']).run(generate_input(total), print)
+    except subprocess.CalledProcessError as e:
+        print('CalledProcessError Expected:', e)
+    try:
+        Pipeline(['openssl', 'enc', '-d', '-des3', '-pbkdf2',
+                  '-pass', 'env:password'], ['cat'], env=env).run(
+            [b'not a ciphertext'], print)
+    except subprocess.CalledProcessError as e:
+        print('CalledProcessError Expected:', e)
@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+'''
+* Brett Slatkin, 2014, "effective Python"
+* Brett Slatkin's example code([GitHub](https://github.com/bslatkin/effectivepython))
+* I modified the example code a bit to confirm my understanding.
+* item36_pool.py is written in Python 3.6
+
+A pool of persistent child processes
+* run_openssl and run_md5 start a fresh child per chunk of data,
+  paying the fork/exec cost every time
+* instead, start a fixed set of long-lived children once and stream
+  many small payloads through them
+* each message on stdin/stdout is framed: a 4-byte big-endian length
+  followed by that many bytes
+* one thread per child feeds it from a shared queue of jobs; the
+  threads spend their time blocked on pipes, so the GIL is no problem
+'''
+from queue import Queue
+from threading import Thread
+from time import time
+import hashlib
+import os
+import shutil
+import struct
+import subprocess
+import sys
+
+HEADER = struct.Struct('>I')
+
+# What a child can do with each payload
+HANDLERS = {
+    'md5': lambda data: hashlib.md5(data).hexdigest().encode('ascii'),
+    'sha256': lambda data: hashlib.sha256(data).hexdigest().encode('ascii'),
+    'echo': lambda data: data,
+}
+
+
+def read_frame(stream):
+    header = stream.read(HEADER.size)
+    if len(header) < HEADER.size:
+        return None  # EOF: the other side closed the pipe
+    size, = HEADER.unpack(header)
+    data = stream.read(size)
+    if len(data) < size:
+        raise EOFError('truncated frame')
+    return data
+
+
+def write_frame(stream, data):
+    stream.write(HEADER.pack(len(data)))
+    stream.write(data)
+    stream.flush()  # Ensure the other side gets the whole frame
+
+
+def worker_main(handler_name):
+    """The loop run by each child: one frame in, one frame out"""
+    handler = HANDLERS[handler_name]
+    stdin, stdout = sys.stdin.buffer, sys.stdout.buffer
+    while True:
+        data = read_frame(stdin)
+        if data is None:
+            return
+        write_frame(stdout, handler(data))
+
+
+class WorkerError(Exception):
+    """A child died or broke the protocol while handling a payload"""
+
+
+class ProcessPool(object):
+    def __init__(self, handler_name, workers=os.cpu_count()):
+        self.handler_name = handler_name
+        self.procs = []
+        self.restarts = 0
+        self._jobs = Queue()
+        self._threads = []
+        for slot in range(workers):
+            self.procs.append(self._start())
+            thread = Thread(target=self._feed, args=(slot,), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _start(self):
+        return subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__),
+             '--worker', self.handler_name],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE)
+
+    def _stop(self, proc):
+        try:
+            proc.stdin.close()
+        except OSError:
+            pass  # Unflushed data for a dead child
+        proc.stdout.close()
+        proc.wait()
+
+    def _feed(self, slot):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                self._stop(self.procs[slot])
+                return
+            index, data, results, done = job
+            proc = self.procs[slot]
+            try:
+                write_frame(proc.stdin, data)
+                result = read_frame(proc.stdout)
+                if result is None:
+                    raise EOFError('worker exited')
+            except Exception as e:
+                # Fail this payload, and put a fresh child in the slot so
+                # the rest of the jobs still have somewhere to go. Any
+                # failure counts: the child may hold half a frame
+                done.put((index, WorkerError(
+                    'pid %d failed on payload %d: %r' % (proc.pid, index, e))))
+                proc.kill()
+                self._stop(proc)
+                self.procs[slot] = self._start()
+                self.restarts += 1
+            else:
+                results[index] = result
+                done.put((index, None))
+
+    def map(self, payloads):
+        """
+        Outputs for payloads, in order. Raises TypeError before queueing
+        anything if a payload isn't bytes, and WorkerError if a child
+        failed on any of them, after every payload has been handled.
+        """
+        payloads = list(payloads)
+        for data in payloads:
+            if not isinstance(data, (bytes, bytearray)):
+                raise TypeError('payloads must be bytes, not %s' %
+                                type(data).__name__)
+        results = [None] * len(payloads)
+        done = Queue()
+        for index, data in enumerate(payloads):
+            self._jobs.put((index, data, results, done))
+        errors = []
+        for _ in payloads:
+            index, error = done.get()
+            if error is not None:
+                errors.append(error)
+        if errors:
+            raise errors[0]
+        return results
+
+    def close(self):
+        for _ in self._threads:
+            self._jobs.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def run_md5(data):
+    """One Popen per payload, like item36 (md5 on macOS, md5sum on Linux)"""
+    command = 'md5' if shutil.which('md5') else 'md5sum'
+    proc = subprocess.Popen(
+        [command],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE)
+    out, _ = proc.communicate(data)
+    return out.split()[0]
+
+
+if __name__=="__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == '--worker':
+        worker_main(sys.argv[2])
+        sys.exit(0)
+
+    payloads = [os.urandom(64) for _ in range(500)]
+
+    print("one Popen per payload")
+    start = time()
+    expected = [run_md5(data) for data in payloads]
+    end = time()
+    print('Took %.3f seconds, %.0f payloads per second' %
+          (end - start, len(payloads) / (end - start)))
+    print("")
+
+    print("persistent pool of %d children" % os.cpu_count())
+    start = time()
+    with ProcessPool('md5') as pool:
+        started = time()
+        results = pool.map(payloads)
+        finished = time()
+    end = time()
+    assert results == expected
+    print('Took %.3f seconds including startup and shutdown' % (end - start))
+    print('Streaming only: %.3f seconds, %.0f payloads per second' %
+          (finished - started, len(payloads) / (finished - started)))
+    print("")
+
+    print("a child that dies fails its payload and is replaced")
+    with ProcessPool('md5', workers=2) as pool:
+        pool.procs[0].kill()
+        try:
+            pool.map(payloads[:10])
+        except WorkerError as e:
+            print('WorkerError Expected:', e)
+        assert pool.map(payloads[:10]) == expected[:10]
+        print('restarts: %d, later maps still work' % pool.restarts)
+        try:
+            pool.map(['abc'])
+        except TypeError as e:
+            print('TypeError Expected:', e)
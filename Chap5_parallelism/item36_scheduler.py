@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+'''
+* Brett Slatkin, 2014, "effective Python"
+* Brett Slatkin's example code([GitHub](https://github.com/bslatkin/effectivepython))
+* I modified the example code a bit to confirm my understanding.
+* item36_scheduler.py is written in Python 3.7
+
+Scheduling thousands of child processes with asyncio
+* item36 manages children by hand: a poll() loop with sleep(0.2),
+  and communicate(timeout=0.1) followed by terminate()
+* polling adds up to 0.2 seconds of latency per child, and nothing
+  limits how many children run at once
+* asyncio is told by the OS when a child exits or writes output,
+  so there is no polling at all
+* a Semaphore caps how many children run at the same time
+* every job has a deadline: SIGTERM first, then SIGKILL if the
+  child is still alive after a grace period
+* each child leads its own process group, so the signals also reach
+  anything it started (e.g. the commands run by sh -c)
+'''
+from time import sleep, time
+import asyncio
+import os
+import signal
+import subprocess
+
+OK = 'ok'
+TIMEOUT = 'timeout'
+ERROR = 'error'
+
+
+class Job(object):
+    def __init__(self, command, input=None, deadline=None, on_done=None):
+        self.command = command
+        self.input = input
+        self.deadline = deadline
+        self.on_done = on_done
+        self.status = None
+        self.returncode = None
+        self.stdout = None
+        self.elapsed = None
+
+    def __repr__(self):
+        return ('Job(%r, status=%s, returncode=%r, elapsed=%.3f)' %
+                (' '.join(self.command), self.status, self.returncode,
+                 self.elapsed or 0))
+
+
+class ProcessScheduler(object):
+    def __init__(self, max_parallel, grace=0.5):
+        self.max_parallel = max_parallel
+        self.grace = grace
+        self.running = 0
+        self.peak = 0
+
+    async def run_job(self, job, semaphore):
+        async with semaphore:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            start = time()
+            try:
+                await self._run(job)
+            finally:
+                self.running -= 1
+                job.elapsed = time() - start
+        if job.on_done is not None:
+            job.on_done(job)
+        return job
+
+    async def _run(self, job):
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *job.command,
+                stdin=(subprocess.PIPE if job.input is not None
+                       else subprocess.DEVNULL),
+                stdout=subprocess.PIPE,
+                start_new_session=True)
+        except OSError:
+            job.status = ERROR
+            return
+        try:
+            job.stdout, _ = await asyncio.wait_for(
+                proc.communicate(job.input), job.deadline)
+            job.status = OK if proc.returncode == 0 else ERROR
+        except asyncio.TimeoutError:
+            job.status = TIMEOUT
+            await self._stop(proc)
+        except BaseException:
+            # Cancelled or interrupted: the child is in its own session,
+            # so nothing else would stop it
+            await self._stop(proc)
+            job.returncode = proc.returncode
+            raise
+        job.returncode = proc.returncode
+
+    async def _stop(self, proc):
+        """Kill escalation: SIGTERM, then SIGKILL after the grace period"""
+        if proc.returncode is not None:
+            return
+        self._signal_group(proc, signal.SIGTERM)
+        try:
+            await asyncio.wait_for(proc.wait(), self.grace)
+        except asyncio.TimeoutError:
+            self._signal_group(proc, signal.SIGKILL)
+            await proc.wait()
+
+    @staticmethod
+    def _signal_group(proc, signum):
+        try:
+            os.killpg(proc.pid, signum)
+        except ProcessLookupError:
+            pass  # Already gone
+
+    async def run(self, jobs):
+        semaphore = asyncio.Semaphore(self.max_parallel)
+        return await asyncio.gather(
+            *[self.run_job(job, semaphore) for job in jobs])
+
+    def run_all(self, jobs):
+        return asyncio.run(self.run(jobs))
+
+
+def run_polling(commands, max_parallel):
+    """The item36 way: Popen, then poll() with sleep(0.2)"""
+    pending = list(commands)
+    running = []
+    while pending or running:
+        while pending and len(running) < max_parallel:
+            running.append(subprocess.Popen(pending.pop()))
+        sleep(0.2)
+        running = [proc for proc in running if proc.poll() is None]
+
+
+if __name__=="__main__":
+    count, max_parallel = 200, 20
+    print("%d children of sleep 0.05, at most %d at a time" %
+          (count, max_parallel))
+    commands = [['sleep', '0.05']] * count
+    start = time()
+    run_polling(commands, max_parallel)
+    end = time()
+    print('poll() with sleep(0.2): took %.3f seconds' % (end - start))
+
+    done = []
+    scheduler = ProcessScheduler(max_parallel)
+    start = time()
+    scheduler.run_all([Job(command, on_done=done.append)
+                       for command in commands])
+    end = time()
+    print('ProcessScheduler:       took %.3f seconds, peak %d running, '
+          '%d callbacks' % (end - start, scheduler.peak, len(done)))
+    print("")
+
+    print("deadlines and kill escalation")
+    jobs = [
+        Job(['echo', 'Hello from the child!'], deadline=1),
+        Job(['openssl', 'enc', '-des3', '-pbkdf2', '-pass', 'pass:secret'],
+            input=b'some data', deadline=1),
+        Job(['sleep', '10'], deadline=0.1),
+        # Ignores SIGTERM, so it has to be killed
+        Job(['sh', '-c', "trap '' TERM; sleep 10"], deadline=0.1),
+        Job(['no-such-command']),
+    ]
+    for job in ProcessScheduler(max_parallel, grace=0.2).run_all(jobs):
+        print(job)
+    print("")
+
+    print("cancelling run() stops its children")
+    jobs = [Job(['sleep', '10'])]
+
+    async def cancel_run():
+        try:
+            await asyncio.wait_for(ProcessScheduler(1).run(jobs), 0.1)
+        except asyncio.TimeoutError:
+            print('TimeoutError Expected, child returncode %r' %
+                  jobs[0].returncode)
+    asyncio.run(cancel_run())
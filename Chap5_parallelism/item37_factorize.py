@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+'''
+* Brett Slatkin, 2014, "effective Python"
+* Brett Slatkin's example code([GitHub](https://github.com/bslatkin/effectivepython))
+* I modified the example code a bit to confirm my understanding.
+* item37_factorize.py is written in Python 3.8
+
+A fast factorization engine for item37's factorize()
+* item37's factorize() tests every integer from 1 to n: O(n) per number
+* trial division only needs primes up to sqrt(n), taken from a cached sieve
+* whatever is left after trial division is either prime (checked with
+  a deterministic Miller-Rabin test for 64-bit inputs) or split with
+  Pollard's rho
+* every divisor is a product of prime powers, so the divisors come from
+  the prime factorization; factorize() still yields them in ascending order
+'''
+from bisect import bisect_right
+from math import gcd, isqrt
+from time import time
+
+import item37
+
+# Trial division covers primes up to this bound; beyond it, Pollard's rho
+TRIAL_LIMIT = 1 << 16
+
+_primes = [2]
+_sieved_to = 2
+
+
+def primes_up_to(limit):
+    """Primes <= limit, from a sieve that is extended and cached"""
+    global _primes, _sieved_to
+    if limit > _sieved_to:
+        sieve = bytearray([1]) * (limit + 1)
+        sieve[0:2] = b'\x00\x00'
+        for i in range(2, isqrt(limit) + 1):
+            if sieve[i]:
+                sieve[i * i::i] = bytes(len(range(i * i, limit + 1, i)))
+        _primes = [i for i, is_prime in enumerate(sieve) if is_prime]
+        _sieved_to = limit
+    if limit == _sieved_to:
+        return _primes
+    return _primes[:bisect_right(_primes, limit)]
+
+
+# These bases make Miller-Rabin exact for every n < 3.3 * 10**24
+_WITNESSES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+
+def is_prime(n):
+    if n < 2:
+        return False
+    for p in _WITNESSES:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in _WITNESSES:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def pollard_rho(n):
+    """A non-trivial factor of the odd composite n (Brent's variant)"""
+    for c in range(1, n):
+        y, m, g, r, q = 2, 128, 1, 1, 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:
+            # Backtrack one step at a time
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = gcd(abs(x - ys), n)
+        if g != n:
+            return g
+    raise ValueError('no factor found for %d' % n)
+
+
+def prime_factors(number):
+    """{prime: exponent} for number >= 1"""
+    if number < 1:
+        raise ValueError('%d must be >= 1' % number)
+    factors = {}
+    n = number
+    for p in primes_up_to(TRIAL_LIMIT):
+        if p * p > n:
+            break
+        if n % p == 0:
+            exponent = 0
+            while n % p == 0:
+                n //= p
+                exponent += 1
+            factors[p] = exponent
+    if n > 1:
+        pending = [n]
+        while pending:
+            n = pending.pop()
+            if n < TRIAL_LIMIT * TRIAL_LIMIT or is_prime(n):
+                # No prime factor below TRIAL_LIMIT is left, so n is prime
+                factors[n] = factors.get(n, 0) + 1
+            else:
+                d = pollard_rho(n)
+                pending.extend((d, n // d))
+    return factors
+
+
+def divisors(factors):
+    """All divisors from {prime: exponent}, in ascending order"""
+    result = [1]
+    for p, exponent in factors.items():
+        powers = [p ** e for e in range(1, exponent + 1)]
+        result += [d * power for d in result for power in powers]
+    result.sort()
+    return result
+
+
+def factorize(number):
+    """
+    Same interface as item37's factorize(): a generator
+    of all the divisors of number, in ascending order
+    """
+    yield from divisors(prime_factors(number))
+
+
+if __name__=="__main__":
+    numbers = [2139079, 1214759, 1516637, 1852285]
+    print("item37 numbers")
+    start = time()
+    expected = [list(item37.factorize(number)) for number in numbers]
+    end = time()
+    print('naive factorize: took %.3f seconds' % (end - start))
+
+    start = time()
+    results = [list(factorize(number)) for number in numbers]
+    end = time()
+    assert results == expected
+    print('fast factorize:  took %.6f seconds' % (end - start))
+    for number in numbers:
+        print(number, prime_factors(number))
+    print("")
+
+    print("64-bit inputs")
+    numbers = [
+        2 ** 64 - 1,
+        4294967291 * 4294967279,        # two 32-bit primes
+        18446744073709551557,           # the largest 64-bit prime
+        600851475143,
+        2 ** 63,
+        3 ** 40,
+    ]
+    start = time()
+    for number in numbers:
+        factors = prime_factors(number)
+        product = 1
+        for p, exponent in factors.items():
+            assert is_prime(p)
+            product *= p ** exponent
+        assert product == number
+        print(number, factors, '%d divisors' % len(divisors(factors)))
+    end = time()
+    print('Took %.3f seconds' % (end - start))
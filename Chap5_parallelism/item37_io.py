@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+'''
+* Brett Slatkin, 2014, "effective Python"
+* Brett Slatkin's example code([GitHub](https://github.com/bslatkin/effectivepython))
+* I modified the example code a bit to confirm my understanding.
+* item37_io.py is written in Python 3.7
+
+A bounded thread pool for blocking I/O
+* item37 starts one raw Thread per slow_systemcall() and joins them by hand
+* thousands of calls would mean thousands of threads (memory, start-up
+  cost, file descriptors)
+* a fixed pool of threads overlaps the blocking calls just as well,
+  because the GIL is released while a thread waits in a system call
+* futures make the overlap with compute explicit: submit the I/O,
+  compute, then collect the results
+* per-call timeouts, and an asyncio bridge for async code
+'''
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, wait
+from threading import Lock, Thread
+from time import sleep, time
+import asyncio
+import select
+import socket
+
+from item37 import compute_helicopter_location
+
+
+def slow_systemcall():
+    """
+    Asks the OS system to block for 0.1 seconds. item37 selects on an
+    unconnected socket, which Linux reports as ready at once; one end of
+    an idle socketpair really blocks, and is closed afterwards.
+    """
+    a, b = socket.socketpair()
+    with a, b:
+        select.select([a], [], [], 0.1)
+
+
+class BlockingIOExecutor(object):
+    def __init__(self, max_workers=32):
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers,
+                                        thread_name_prefix='blocking-io')
+        self._lock = Lock()
+        self.active = 0
+        self.peak = 0
+        self.completed = 0
+
+    def _track(self, fn, args, kwargs):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+
+    def submit(self, fn, *args, **kwargs):
+        """Start fn in the pool; returns a concurrent.futures.Future"""
+        return self._pool.submit(self._track, fn, args, kwargs)
+
+    def call(self, fn, *args, timeout=None, **kwargs):
+        """
+        Run fn in the pool and wait for its result. On timeout, raises
+        TimeoutError; a call that hasn't started yet is cancelled, but a
+        running thread can't be interrupted, so it finishes in the background.
+        """
+        future = self.submit(fn, *args, **kwargs)
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def map(self, fn, *iterables, timeout=None):
+        """Like Executor.map; timeout applies to the whole batch"""
+        return self._pool.map(lambda *args: self._track(fn, args, {}),
+                              *iterables, timeout=timeout)
+
+    async def run(self, fn, *args, timeout=None):
+        """asyncio bridge: await a blocking call without blocking the loop"""
+        loop = asyncio.get_running_loop()
+        return await asyncio.wait_for(
+            loop.run_in_executor(self._pool, self._track, fn, args, {}),
+            timeout)
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+
+def one_thread_per_call(count):
+    """The item37 way"""
+    threads = []
+    for _ in range(count):
+        thread = Thread(target=slow_systemcall)
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+
+
+async def async_main(executor):
+    start = time()
+    await asyncio.gather(*[executor.run(slow_systemcall) for _ in range(100)])
+    print('100 calls awaited from asyncio: took %.3f seconds' %
+          (time() - start))
+    try:
+        await executor.run(sleep, 1, timeout=0.1)
+    except asyncio.TimeoutError:
+        print('asyncio.TimeoutError Expected')
+
+
+if __name__=="__main__":
+    count = 200
+    print("%d blocking calls of 0.1 seconds" % count)
+    start = time()
+    one_thread_per_call(count)
+    end = time()
+    print('one thread per call:   took %.3f seconds, %d threads' %
+          (end - start, count))
+
+    with BlockingIOExecutor(max_workers=50) as executor:
+        start = time()
+        list(executor.map(lambda _: slow_systemcall(), range(count)))
+        end = time()
+        print('BlockingIOExecutor:    took %.3f seconds, %d threads' %
+              (end - start, executor.peak))
+    print("the cap trades some latency for a bounded number of threads")
+    print("")
+
+    print("overlapping the system calls with compute, explicitly")
+    with BlockingIOExecutor(max_workers=5) as executor:
+        start = time()
+        futures = [executor.submit(slow_systemcall) for _ in range(5)]
+        for i in range(5):
+            compute_helicopter_location(i)
+        wait(futures)
+        end = time()
+    print('Took %.3f seconds' % (end - start))
+    print("")
+
+    print("per-call timeouts")
+    with BlockingIOExecutor(max_workers=2) as executor:
+        try:
+            executor.call(sleep, 0.5, timeout=0.1)
+        except TimeoutError:
+            print('TimeoutError Expected')
+        print('within the timeout:', executor.call(sum, [1, 2, 3], timeout=1))
+    print("")
+
+    print("asyncio bridge")
+    with BlockingIOExecutor(max_workers=50) as executor:
+        asyncio.run(async_main(executor))
@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+'''
+* Brett Slatkin, 2014, "effective Python"
+* Brett Slatkin's example code([GitHub](https://github.com/bslatkin/effectivepython))
+* I modified the example code a bit to confirm my understanding.
+* item37_memo.py is written in Python 3.8
+
+Memoizing factorizations
+* when the same numbers are factored over and over, remember the answers
+* an in-process LRU holds the hot numbers
+* an optional dbm file keeps them across runs: a compact key/value store
+  from the standard library
+* a number shares factors with its divisors: while trial division strips
+  small primes off n, each remaining cofactor is looked up too, so work
+  done for a divisor seen earlier is reused
+'''
+from collections import OrderedDict
+from time import time
+import dbm
+import os
+import random
+import shutil
+import tempfile
+
+from item37_factorize import (TRIAL_LIMIT, divisors, is_prime, pollard_rho,
+                              primes_up_to)
+
+
+def encode(factors):
+    return ','.join('%d:%d' % item for item in sorted(factors.items())).encode()
+
+
+def decode(data):
+    factors = {}
+    if not data:
+        return factors  # 1 has no prime factors
+    for item in data.decode().split(','):
+        p, exponent = item.split(':')
+        factors[int(p)] = int(exponent)
+    return factors
+
+
+class FactorCache(object):
+    def __init__(self, maxsize=100000, path=None):
+        self.maxsize = maxsize
+        self._lru = OrderedDict()
+        self._disk = dbm.open(path, 'c') if path else None
+        self.hits = 0
+        self.disk_hits = 0
+        self.divisor_hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return ('FactorCache(size=%d, hits=%d, disk_hits=%d, '
+                'divisor_hits=%d, misses=%d, hit_rate=%.1f%%)' %
+                (len(self._lru), self.hits, self.disk_hits,
+                 self.divisor_hits, self.misses, self.hit_rate * 100))
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.disk_hits + self.divisor_hits + self.misses
+        if not lookups:
+            return 0.0
+        return (self.hits + self.disk_hits + self.divisor_hits) / lookups
+
+    def _get(self, number):
+        factors = self._lru.get(number)
+        if factors is not None:
+            self._lru.move_to_end(number)
+            return factors, 'memory'
+        if self._disk is not None:
+            data = self._disk.get(str(number))
+            if data is not None:
+                factors = decode(data)
+                self._remember(number, factors, persist=False)
+                return factors, 'disk'
+        return None, None
+
+    def _remember(self, number, factors, persist=True):
+        self._lru[number] = factors
+        if len(self._lru) > self.maxsize:
+            self._lru.popitem(last=False)
+        if persist and self._disk is not None:
+            self._disk[str(number)] = encode(factors)
+
+    def prime_factors(self, number):
+        """{prime: exponent}, like item37_factorize.prime_factors"""
+        if number < 1:
+            raise ValueError('%d must be >= 1' % number)
+        factors, source = self._get(number)
+        if source == 'memory':
+            self.hits += 1
+            return dict(factors)
+        if source == 'disk':
+            self.disk_hits += 1
+            return dict(factors)
+
+        factors = {}
+        n = number
+        reused = None
+        for p in primes_up_to(TRIAL_LIMIT):
+            if p * p > n:
+                break
+            if n % p == 0:
+                while n % p == 0:
+                    n //= p
+                    factors[p] = factors.get(p, 0) + 1
+                if n > 1:
+                    reused, _ = self._get(n)
+                    if reused is not None:
+                        break
+        if reused is not None:
+            self.divisor_hits += 1
+            for p, exponent in reused.items():
+                factors[p] = factors.get(p, 0) + exponent
+        else:
+            self.misses += 1
+            if n > 1:
+                cofactor = n
+                cofactor_factors = {}
+                pending = [n]
+                while pending:
+                    n = pending.pop()
+                    if n < TRIAL_LIMIT * TRIAL_LIMIT or is_prime(n):
+                        cofactor_factors[n] = cofactor_factors.get(n, 0) + 1
+                    else:
+                        d = pollard_rho(n)
+                        pending.extend((d, n // d))
+                for p, exponent in cofactor_factors.items():
+                    factors[p] = factors.get(p, 0) + exponent
+                if cofactor != number:
+                    # The expensive part, reusable by multiples of it
+                    self._remember(cofactor, cofactor_factors)
+        self._remember(number, factors)
+        return dict(factors)
+
+    def factorize(self, number):
+        """Same interface as item37's factorize()"""
+        yield from divisors(self.prime_factors(number))
+
+    def close(self):
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+
+if __name__=="__main__":
+    numbers = [2139079, 1214759, 1516637, 1852285]
+    cache = FactorCache()
+    for _ in range(1000):
+        for number in numbers:
+            list(cache.factorize(number))
+    print("item37 numbers, 1000 times each")
+    print(cache)
+    print("")
+
+    print("reusing the factors of a divisor seen earlier")
+    cache = FactorCache()
+    big = 4294967291 * 4294967279
+    start = time()
+    cache.prime_factors(big)
+    end = time()
+    print('%d: took %.6f seconds' % (big, end - start))
+    start = time()
+    print(cache.prime_factors(6 * big))
+    end = time()
+    print('%d: took %.6f seconds' % (6 * big, end - start))
+    print(cache)
+    print("")
+
+    print("a skewed workload of 56-bit numbers, persisted to disk")
+    rand = random.Random(1)
+    pool = [rand.getrandbits(56) | 1 for _ in range(300)]
+    workload = [pool[int(rand.paretovariate(1.2)) % len(pool)]
+                for _ in range(3000)]
+    workdir = tempfile.mkdtemp()
+    path = os.path.join(workdir, 'factors')
+
+    start = time()
+    cache = FactorCache(maxsize=100, path=path)
+    for number in workload:
+        cache.prime_factors(number)
+    cache.close()
+    end = time()
+    print('first run:  took %.3f seconds, %r' % (end - start, cache))
+
+    start = time()
+    cache = FactorCache(maxsize=100, path=path)
+    for number in workload:
+        cache.prime_factors(number)
+    cache.close()
+    end = time()
+    print('second run: took %.3f seconds, %r' % (end - start, cache))
+    shutil.rmtree(workdir)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+'''
+* Brett Slatkin, 2014, "effective Python"
+* Brett Slatkin's example code([GitHub](https://github.com/bslatkin/effectivepython))
+* I modified the example code a bit to confirm my understanding.
+* item37_pool.py is written in Python 3.8
+
+Factoring large batches on every core
+* FactorizeThread shows that threads make CPU-bound factorization
+  slower: only one thread runs bytecode at a time because of the GIL
+* child processes each have their own GIL, so they really run in parallel
+* factorize_many() sends the numbers to a multiprocessing.Pool in chunks
+  (one pickle round trip per chunk, not per number)
+* the prime sieve is built once in the parent and handed to each worker
+  once, through the pool initializer
+* results stream back as they are ready, in input order or unordered
+'''
+from multiprocessing import Pool
+from threading import Thread
+from time import time
+import os
+import random
+
+import item37_factorize
+from item37_factorize import TRIAL_LIMIT, divisors, prime_factors, primes_up_to
+
+
+def _init_worker(primes, sieved_to):
+    # Reuse the parent's sieve instead of sieving again in every worker
+    item37_factorize._primes = primes
+    item37_factorize._sieved_to = sieved_to
+
+
+def _factor(number):
+    return number, prime_factors(number)
+
+
+def factorize_many(numbers, workers=None, chunksize=None, ordered=True):
+    """
+    Yield (number, {prime: exponent}) for each number, computed by
+    a pool of worker processes. With ordered=False results come back
+    as soon as they are done, in any order.
+    """
+    numbers = list(numbers)
+    workers = workers or os.cpu_count()
+    if chunksize is None:
+        # A few chunks per worker keeps them all busy until the end
+        chunksize = max(1, len(numbers) // (workers * 4))
+    primes = primes_up_to(TRIAL_LIMIT)
+    with Pool(workers, initializer=_init_worker,
+              initargs=(primes, TRIAL_LIMIT)) as pool:
+        if ordered:
+            results = pool.imap(_factor, numbers, chunksize)
+        else:
+            results = pool.imap_unordered(_factor, numbers, chunksize)
+        yield from results
+
+
+class FactorizeThread(Thread):
+    """item37's thread, with the fast engine"""
+    def __init__(self, numbers):
+        super().__init__()
+        self.numbers = numbers
+
+    def run(self):
+        self.factors = [prime_factors(number) for number in self.numbers]
+
+
+def semiprimes(count, seed=1):
+    """Products of two random ~28-bit primes: real work for Pollard's rho"""
+    rand = random.Random(seed)
+    result = []
+    while len(result) < count:
+        p, q = rand.getrandbits(28) | 1, rand.getrandbits(28) | 1
+        if item37_factorize.is_prime(p) and item37_factorize.is_prime(q):
+            result.append(p * q)
+    return result
+
+
+if __name__=="__main__":
+    numbers = semiprimes(400)
+    print("factoring %d 56-bit semiprimes" % len(numbers))
+
+    start = time()
+    expected = [prime_factors(number) for number in numbers]
+    end = time()
+    serial = end - start
+    print('serial:          took %.3f seconds' % serial)
+
+    threads = []
+    start = time()
+    for i in range(4):
+        thread = FactorizeThread(numbers[i::4])
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    end = time()
+    print('4 threads:       took %.3f seconds' % (end - start))
+
+    for workers in sorted({1, 2, 4, os.cpu_count()}):
+        start = time()
+        results = list(factorize_many(numbers, workers=workers))
+        end = time()
+        assert [factors for _, factors in results] == expected
+        print('%2d processes:    took %.3f seconds, speedup %.2fx' %
+              (workers, end - start, serial / (end - start)))
+    print("(%d cores on this machine)" % os.cpu_count())
+    print("")
+
+    print("unordered streaming: first result of a batch")
+    start = time()
+    for number, factors in factorize_many(numbers, ordered=False,
+                                          chunksize=1):
+        print('%d = %s after %.3f seconds' %
+              (number, ' * '.join(map(str, factors)), time() - start))
+        print('divisors:', divisors(factors))
+        break
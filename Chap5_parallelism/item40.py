@@ -40,6 +40,12 @@ def minimize():
 #
 # Conway's the game of life
 #
+ALIVE = '*'
+EMPTY = '-'
+Query = namedtuple('Query', ('y', 'x'))
+Transition = namedtuple('Transition', ('y', 'x', 'state'))
+TICK = object()
+
 def count_neighbors(y, x):
     """
     a coroutine:
@@ -187,9 +193,6 @@ if __name__=="__main__":
     # Conway's the game of life
     #
     """)
-    ALIVE = '*'
-    EMPTY = '-'
-    Query = namedtuple('Query', ('y', 'x'))
 
     print("testing the count_neighbors functions with fake data")
     it = count_neighbors(10, 5)
@@ -210,7 +213,6 @@ if __name__=="__main__":
         print('Count: ', e.value)  # Value from return statement
     print("")
 
-    Transition = namedtuple('Transition', ('y', 'x', 'state'))
     print("testing the step_cell functions with fake data")
     it = step_cell(10, 5)
     q0 = next(it)           # Initial location query
@@ -229,7 +231,6 @@ if __name__=="__main__":
     print('Outcome: ', t1)
     print("")
 
-    TICK = object()
     print("testing the grid class")
     grid = Grid(5, 9)
     grid.assign(0, 3, ALIVE)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+'''
+* Brett Slatkin, 2014, "effective Python"
+* Brett Slatkin's example code([GitHub](https://github.com/bslatkin/effectivepython))
+* I modified the example code a bit to confirm my understanding.
+* item40_bytegrid.py is written in Python 3.6
+
+A compact Grid in one bytearray, double-buffered
+* item40's Grid keeps a list of lists of one-character strings: a pointer
+  per cell, and live_a_generation() allocates a new Grid every tick
+* ByteGrid keeps one byte per cell in a flat bytearray, 0 for EMPTY and
+  1 for ALIVE
+* two buffers: the next generation is written into the back buffer, then
+  the buffers are swapped, so no grid is allocated after the first tick
+* query()/assign()/__str__ behave like Grid's, so the coroutine simulator
+  runs on it unchanged
+'''
+from time import time
+import sys
+
+from item40 import (ALIVE, EMPTY, TICK, ColumnPrinter, Grid, Query,
+                    live_a_generation, simulate)
+
+# game_logic() as a table, indexed by state * 9 + neighbors
+RULE = bytes(1 if n == 3 or (state and n == 2) else 0
+             for state in (0, 1) for n in range(9))
+
+
+class ByteGrid(object):
+    def __init__(self, height, width):
+        self.height = height
+        self.width = width
+        self.cells = bytearray(height * width)
+        self._back = bytearray(height * width)
+
+    def __str__(self):
+        text = self.cells.translate(b'-*' + bytes(254)).decode()
+        return ''.join(text[i:i + self.width] + '\n'
+                       for i in range(0, len(text), self.width))
+
+    def query(self, y, x):
+        if self.cells[(y % self.height) * self.width + x % self.width]:
+            return ALIVE
+        return EMPTY
+
+    def assign(self, y, x, state):
+        self.cells[(y % self.height) * self.width + x % self.width] = (
+            state == ALIVE)
+
+    @classmethod
+    def from_grid(cls, grid):
+        result = cls(grid.height, grid.width)
+        result.cells[:] = b''.join(
+            bytes(cell == ALIVE for cell in row) for row in grid.rows)
+        return result
+
+    def to_grid(self):
+        grid = Grid(self.height, self.width)
+        for y in range(self.height):
+            row = self.cells[y * self.width:(y + 1) * self.width]
+            grid.rows[y] = [ALIVE if cell else EMPTY for cell in row]
+        return grid
+
+    def _swap(self):
+        self.cells, self._back = self._back, self.cells
+
+    def live_a_generation(self, sim):
+        """item40's live_a_generation(), writing into the back buffer"""
+        cells, back, width, height = (self.cells, self._back,
+                                      self.width, self.height)
+        item = next(sim)
+        while item is not TICK:
+            if isinstance(item, Query):
+                state = cells[(item.y % height) * width + item.x % width]
+                item = sim.send(ALIVE if state else EMPTY)
+            else:  # Must be a Transition
+                back[item.y * width + item.x] = item.state == ALIVE
+                item = next(sim)
+        self._swap()
+        return self
+
+    def step(self):
+        """
+        One generation without the coroutines: sum the rows above and below
+        column by column, then each cell's count is three adjacent sums
+        minus itself
+        """
+        cells, back, width, height = (self.cells, self._back,
+                                      self.width, self.height)
+        rows = [cells[y * width:(y + 1) * width] for y in range(height)]
+        for y, row in enumerate(rows):
+            above, below = rows[y - 1], rows[(y + 1) % height]
+            sums = [a + b + c for a, b, c in zip(above, row, below)]
+            # Wrap the columns like Grid.query
+            sums = sums[-1:] + sums + sums[:1]
+            back[y * width:(y + 1) * width] = bytes(
+                RULE[state * 9 + left + center + right - state]
+                for state, left, center, right
+                in zip(row, sums, sums[1:], sums[2:]))
+        self._swap()
+        return self
+
+
+def glider(grid):
+    grid.assign(0, 3, ALIVE)
+    grid.assign(1, 4, ALIVE)
+    grid.assign(2, 2, ALIVE)
+    grid.assign(2, 3, ALIVE)
+    grid.assign(2, 4, ALIVE)
+    return grid
+
+
+def grid_size(grid):
+    """Bytes held by a Grid: the outer list and the row lists"""
+    return sys.getsizeof(grid.rows) + sum(map(sys.getsizeof, grid.rows))
+
+
+if __name__=="__main__":
+    print("the glider from item40, on a ByteGrid")
+    grid = glider(ByteGrid(5, 9))
+    sim = simulate(grid.height, grid.width)
+    columns = ColumnPrinter()
+    for i in range(5):
+        columns.append(str(grid))
+        grid.live_a_generation(sim)
+    print(columns)
+    print("")
+
+    height, width, generations = 100, 100, 20
+    print("%dx%d grid, %d generations" % (height, width, generations))
+    grid = Grid(height, width)
+    for i in range(0, height, 10):
+        for j in range(0, width, 10):
+            grid.assign(i + 1, j, ALIVE)
+            grid.assign(i + 1, j + 1, ALIVE)
+            grid.assign(i + 1, j + 2, ALIVE)
+            grid.assign(i + 5, j + 4, ALIVE)
+            grid.assign(i + 6, j + 5, ALIVE)
+            grid.assign(i + 7, j + 3, ALIVE)
+            grid.assign(i + 7, j + 4, ALIVE)
+            grid.assign(i + 7, j + 5, ALIVE)
+    byte_grid = ByteGrid.from_grid(grid)
+    fast_grid = ByteGrid.from_grid(grid)
+    print('Grid:     %d bytes' % grid_size(grid))
+    print('ByteGrid: %d bytes (both buffers)' %
+          (sys.getsizeof(byte_grid.cells) * 2))
+
+    sim = simulate(height, width)
+    start = time()
+    for _ in range(generations):
+        grid = live_a_generation(grid, sim)
+    end = time()
+    print('Grid + coroutines:     took %.3f seconds' % (end - start))
+
+    sim = simulate(height, width)
+    start = time()
+    for _ in range(generations):
+        byte_grid.live_a_generation(sim)
+    end = time()
+    print('ByteGrid + coroutines: took %.3f seconds' % (end - start))
+
+    start = time()
+    for _ in range(generations):
+        fast_grid.step()
+    end = time()
+    print('ByteGrid.step():       took %.3f seconds' % (end - start))
+
+    assert str(byte_grid) == str(grid)
+    assert str(fast_grid) == str(grid)
+    assert str(fast_grid.to_grid()) == str(grid)
+    print("results match")
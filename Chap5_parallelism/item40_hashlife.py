@@ -0,0 +1,368 @@
+#!/usr/bin/env python
+'''
+* Brett Slatkin, 2014, "effective Python"
+* Brett Slatkin's example code([GitHub](https://github.com/bslatkin/effectivepython))
+* I modified the example code a bit to confirm my understanding.
+* item40_hashlife.py is written in Python 3.6
+
+HashLife: millions of generations by memoizing a quadtree
+* the world is a quadtree: a node of level k is a 2**k x 2**k square made
+  of four nodes of level k - 1, down to single cells at level 0
+* nodes are canonical: each distinct square exists once, so equal
+  squares are the same object, and repeated patterns cost nothing extra
+* the future of a node's centre only depends on the node, so it is
+  memoized: successor(node, j) is the centre of node after 2**j
+  generations, computed once from the successors of its sub-squares
+* the caches only grow; collect() keeps the nodes reachable from the
+  root and drops the rest
+* unlike item40's Grid, the world has no edges: it is an unbounded plane,
+  so from_grid()/to_grid() copy cells without the toroidal wrap
+'''
+from time import time
+
+from item40 import ALIVE, EMPTY, ColumnPrinter, Grid
+from item40_sparse import GLIDER, SparseLife
+
+
+class Node(object):
+    __slots__ = ('nw', 'ne', 'sw', 'se', 'level', 'population')
+
+    def __init__(self, nw, ne, sw, se, level, population):
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.level = level
+        self.population = population
+
+    def __repr__(self):
+        return 'Node(level=%d, population=%d)' % (self.level, self.population)
+
+
+DEAD = Node(None, None, None, None, 0, 0)
+LIVE = Node(None, None, None, None, 0, 1)
+
+
+class HashLife(object):
+    def __init__(self, max_nodes=1000000):
+        self.max_nodes = max_nodes
+        self._nodes = {}
+        self._results = {}
+        self._empty = [DEAD]
+        self.root = self.empty(3)
+        # Coordinates of the root's top-left cell
+        self.top = self.left = 0
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.collections = 0
+
+    def __repr__(self):
+        return ('HashLife(nodes=%d, results=%d, hits=%d, misses=%d, '
+                'hit_rate=%.1f%%, collections=%d)' %
+                (len(self._nodes), len(self._results), self.hits,
+                 self.misses, self.hit_rate * 100, self.collections))
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        if not lookups:
+            return 0.0
+        return self.hits / lookups
+
+    @property
+    def population(self):
+        return self.root.population
+
+    def join(self, nw, ne, sw, se):
+        """The canonical node made of four nodes of the same level"""
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            node = Node(nw, ne, sw, se, nw.level + 1,
+                        nw.population + ne.population +
+                        sw.population + se.population)
+            self._nodes[key] = node
+        return node
+
+    def empty(self, level):
+        while len(self._empty) <= level:
+            e = self._empty[-1]
+            self._empty.append(self.join(e, e, e, e))
+        return self._empty[level]
+
+    def centre(self, node):
+        """The middle half of node, one level down"""
+        return self.join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def expand(self, node):
+        """node in the middle of an empty node twice as wide"""
+        e = self.empty(node.level - 1)
+        return self.join(self.join(e, e, e, node.nw),
+                         self.join(e, e, node.ne, e),
+                         self.join(e, node.sw, e, e),
+                         self.join(node.se, e, e, e))
+
+    def _life_4x4(self, node):
+        """One generation of the centre 2x2 of a level 2 node"""
+        rows = [
+            [node.nw.nw, node.nw.ne, node.ne.nw, node.ne.ne],
+            [node.nw.sw, node.nw.se, node.ne.sw, node.ne.se],
+            [node.sw.nw, node.sw.ne, node.se.nw, node.se.ne],
+            [node.sw.sw, node.sw.se, node.se.sw, node.se.se],
+        ]
+        cells = []
+        for y in (1, 2):
+            for x in (1, 2):
+                neighbors = sum(rows[y + dy][x + dx].population
+                                for dy in (-1, 0, 1) for dx in (-1, 0, 1)
+                                if dy or dx)
+                alive = rows[y][x].population
+                if neighbors == 3 or (alive and neighbors == 2):
+                    cells.append(LIVE)
+                else:
+                    cells.append(DEAD)
+        return self.join(*cells)
+
+    def successor(self, node, j):
+        """
+        The centre of node (level k) after 2**j generations, j <= k - 2.
+        Nothing moves faster than one cell per generation, so the centre
+        only depends on what is inside node.
+        """
+        if node.population == 0:
+            return self.empty(node.level - 1)
+        key = (node, j)
+        result = self._results.get(key)
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+
+        if node.level == 2:
+            result = self._life_4x4(node)
+        else:
+            a, b, c, d = node.nw, node.ne, node.sw, node.se
+            # The 9 overlapping sub-squares of level k - 1
+            n00 = a
+            n01 = self.join(a.ne, b.nw, a.se, b.sw)
+            n02 = b
+            n10 = self.join(a.sw, a.se, c.nw, c.ne)
+            n11 = self.join(a.se, b.sw, c.ne, d.nw)
+            n12 = self.join(b.sw, b.se, d.nw, d.ne)
+            n20 = c
+            n21 = self.join(c.ne, d.nw, c.se, d.sw)
+            n22 = d
+            squares = (n00, n01, n02, n10, n11, n12, n20, n21, n22)
+            if j == node.level - 2:
+                # Full speed: 2**(j-1) generations, then 2**(j-1) more
+                r = [self.successor(n, j - 1) for n in squares]
+                j -= 1
+            else:
+                # No time passes here; all 2**j generations happen below
+                r = [self.centre(n) for n in squares]
+            result = self.join(
+                self.successor(self.join(r[0], r[1], r[3], r[4]), j),
+                self.successor(self.join(r[1], r[2], r[4], r[5]), j),
+                self.successor(self.join(r[3], r[4], r[6], r[7]), j),
+                self.successor(self.join(r[4], r[5], r[7], r[8]), j))
+        self._results[key] = result
+        return result
+
+    def _grow(self):
+        half = 1 << (self.root.level - 1)
+        self.root = self.expand(self.root)
+        self.top -= half
+        self.left -= half
+
+    def step(self, j):
+        """Advance the world by 2**j generations"""
+        # Pad until everything alive is in the middle half, with room for
+        # the pattern to grow by 2**j cells on every side
+        while (self.root.level < j + 2 or
+               self.centre(self.root).population != self.root.population):
+            self._grow()
+        self._grow()
+        # The successor is the middle half of the padded root, which is
+        # exactly where the root was before the last _grow()
+        half = 1 << (self.root.level - 2)
+        self.root = self.successor(self.root, j)
+        self.top += half
+        self.left += half
+        self.generation += 1 << j
+        if len(self._nodes) > self.max_nodes:
+            self.collect()
+
+    def advance(self, generations):
+        """Advance by any number of generations, one power of two at a time"""
+        j = 0
+        while generations:
+            if generations & 1:
+                self.step(j)
+            generations >>= 1
+            j += 1
+
+    def collect(self):
+        """Drop the nodes and results not reachable from the root"""
+        keep = {}
+        pending = [self.root] + self._empty[1:]
+        while pending:
+            node = pending.pop()
+            if node.level == 0:
+                continue
+            key = (node.nw, node.ne, node.sw, node.se)
+            if key in keep:
+                continue
+            keep[key] = node
+            pending.extend(key)
+        self._nodes = keep
+        self._results = {
+            (node, j): result for (node, j), result in self._results.items()
+            if (node.nw, node.ne, node.sw, node.se) in keep and
+            (result.nw, result.ne, result.sw, result.se) in keep}
+        self.collections += 1
+
+    def _build(self, cells, level, top, left):
+        if not cells:
+            return self.empty(level)
+        if level == 0:
+            return LIVE
+        half = 1 << (level - 1)
+        quadrants = ([], [], [], [])
+        for y, x in cells:
+            quadrants[(y >= top + half) * 2 + (x >= left + half)].append(
+                (y, x))
+        return self.join(*[
+            self._build(quadrant, level - 1,
+                        top + half * (i // 2), left + half * (i % 2))
+            for i, quadrant in enumerate(quadrants)])
+
+    def set_cells(self, cells):
+        """Replace the world with the live (y, x) cells"""
+        cells = list(cells)
+        top = left = 0
+        size = 1
+        if cells:
+            top = min(y for y, _ in cells)
+            left = min(x for _, x in cells)
+            size = max(max(y for y, _ in cells) - top,
+                       max(x for _, x in cells) - left) + 1
+        level = max(3, (size - 1).bit_length())
+        self.root = self._build(cells, level, top, left)
+        self.top, self.left = top, left
+
+    def cells(self):
+        """Yield the (y, x) of every live cell"""
+        pending = [(self.root, self.top, self.left)]
+        while pending:
+            node, top, left = pending.pop()
+            if node.population == 0:
+                continue
+            if node.level == 0:
+                yield top, left
+                continue
+            half = 1 << (node.level - 1)
+            pending.append((node.nw, top, left))
+            pending.append((node.ne, top, left + half))
+            pending.append((node.sw, top + half, left))
+            pending.append((node.se, top + half, left + half))
+
+    def query(self, y, x):
+        node, top, left = self.root, self.top, self.left
+        size = 1 << node.level
+        if not (top <= y < top + size and left <= x < left + size):
+            return EMPTY
+        while node.level > 0 and node.population:
+            half = 1 << (node.level - 1)
+            south, east = y >= top + half, x >= left + half
+            node = (node.se if east else node.sw) if south else (
+                node.ne if east else node.nw)
+            top += half * south
+            left += half * east
+        return ALIVE if node.population else EMPTY
+
+    @classmethod
+    def from_grid(cls, grid, **kwargs):
+        world = cls(**kwargs)
+        world.set_cells((y, x) for y, row in enumerate(grid.rows)
+                        for x, cell in enumerate(row) if cell == ALIVE)
+        return world
+
+    def to_grid(self, height, width, top=0, left=0):
+        """The height x width window of the world starting at (top, left)"""
+        grid = Grid(height, width)
+        for y, x in self.cells():
+            if top <= y < top + height and left <= x < left + width:
+                grid.assign(y - top, x - left, ALIVE)
+        return grid
+
+
+# Gosper's glider gun, as (y, x): a new glider every 30 generations
+GOSPER_GUN = [
+    (0, 24), (1, 22), (1, 24), (2, 12), (2, 13), (2, 20), (2, 21), (2, 34),
+    (2, 35), (3, 11), (3, 15), (3, 20), (3, 21), (3, 34), (3, 35), (4, 0),
+    (4, 1), (4, 10), (4, 16), (4, 20), (4, 21), (5, 0), (5, 1), (5, 10),
+    (5, 14), (5, 16), (5, 17), (5, 22), (5, 24), (6, 10), (6, 16), (6, 24),
+    (7, 11), (7, 15), (8, 12), (8, 13),
+]
+
+
+if __name__=="__main__":
+    print("the glider from item40")
+    grid = Grid(5, 9)
+    for dy, dx in GLIDER:
+        grid.assign(dy, dx + 2, ALIVE)
+    world = HashLife.from_grid(grid)
+    columns = ColumnPrinter()
+    for i in range(5):
+        columns.append(str(world.to_grid(5, 9)))
+        world.advance(1)
+    print(columns)
+    print("")
+
+    generations = 1000
+    print("Gosper's gun: same cells as SparseLife after %d generations" %
+          generations)
+    world = HashLife()
+    world.set_cells(GOSPER_GUN)
+    sparse = SparseLife(10 ** 6, 10 ** 6)
+    for y, x in GOSPER_GUN:
+        sparse.assign(y + 1000, x + 1000, ALIVE)
+    start = time()
+    sparse.step(generations)
+    end = time()
+    print('SparseLife: took %.3f seconds' % (end - start))
+    start = time()
+    world.advance(generations)
+    end = time()
+    print('HashLife:   took %.3f seconds' % (end - start))
+    assert {(y + 1000, x + 1000) for y, x in world.cells()} == sparse.alive
+    print('results match, population %d' % world.population)
+    print("")
+
+    print("long horizons")
+    for generations in (10 ** 6, 2 ** 30):
+        world = HashLife()
+        world.set_cells(GOSPER_GUN)
+        start = time()
+        world.advance(generations)
+        end = time()
+        print('%d generations: took %.3f seconds, population %d' %
+              (world.generation, end - start, world.population))
+        print('    %r' % world)
+    print("")
+
+    print("a small node budget: collect() runs between steps")
+    expected = HashLife()
+    expected.set_cells(GOSPER_GUN)
+    expected.advance(10 ** 6)
+    world = HashLife(max_nodes=2000)
+    world.set_cells(GOSPER_GUN)
+    start = time()
+    world.advance(10 ** 6)
+    end = time()
+    print('%d generations: took %.3f seconds, population %d' %
+          (world.generation, end - start, world.population))
+    print('    %r' % world)
+    assert set(world.cells()) == set(expected.cells())
+    print('results match')
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+'''
+* Brett Slatkin, 2014, "effective Python"
+* Brett Slatkin's example code([GitHub](https://github.com/bslatkin/effectivepython))
+* I modified the example code a bit to confirm my understanding.
+* item40_numpy.py is written in Python 3.6 with NumPy
+
+A vectorized Game of Life engine next to the coroutine simulator
+* simulate() -> step_cell() -> count_neighbors() yields nine Query
+  objects per cell per generation: a few thousand cells per second
+* with the whole grid in a NumPy array, the neighbor counts of every cell
+  are the sum of the grid shifted in the 8 directions
+* np.roll wraps around the edges, the same toroidal wrap as Grid.query
+'''
+from time import time
+
+import numpy as np
+
+from item40 import ALIVE, ColumnPrinter, Grid, live_a_generation, simulate
+
+# The 8 neighbor offsets, as (dy, dx)
+OFFSETS = [(dy, dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1)
+           if (dy, dx) != (0, 0)]
+
+
+def grid_to_array(grid):
+    """1 for ALIVE and 0 for EMPTY, as a height x width uint8 array"""
+    return np.array([[cell == ALIVE for cell in row] for row in grid.rows],
+                    dtype=np.uint8)
+
+
+def array_to_grid(cells):
+    height, width = cells.shape
+    grid = Grid(height, width)
+    for y, x in zip(*np.nonzero(cells)):
+        grid.assign(int(y), int(x), ALIVE)
+    return grid
+
+
+def count_neighbors(cells):
+    """Living neighbors of every cell, wrapping around the edges"""
+    counts = np.zeros(cells.shape, dtype=np.uint8)
+    for dy, dx in OFFSETS:
+        counts += np.roll(cells, (dy, dx), axis=(0, 1))
+    return counts
+
+
+def step(cells):
+    """game_logic() for the whole grid at once"""
+    neighbors = count_neighbors(cells)
+    born = neighbors == 3
+    survives = (cells == 1) & (neighbors == 2)
+    return (born | survives).astype(np.uint8)
+
+
+class VectorizedLife(object):
+    def __init__(self, grid):
+        self.cells = grid_to_array(grid)
+
+    def step(self, generations=1):
+        for _ in range(generations):
+            self.cells = step(self.cells)
+
+    @property
+    def population(self):
+        return int(self.cells.sum())
+
+    def to_grid(self):
+        return array_to_grid(self.cells)
+
+
+def random_grid(height, width, seed=1):
+    rand = np.random.default_rng(seed)
+    return array_to_grid(
+        (rand.random((height, width)) < 0.3).astype(np.uint8))
+
+
+if __name__=="__main__":
+    print("the glider from item40")
+    grid = Grid(5, 9)
+    grid.assign(0, 3, ALIVE)
+    grid.assign(1, 4, ALIVE)
+    grid.assign(2, 2, ALIVE)
+    grid.assign(2, 3, ALIVE)
+    grid.assign(2, 4, ALIVE)
+    columns = ColumnPrinter()
+    life = VectorizedLife(grid)
+    for i in range(5):
+        columns.append(str(life.to_grid()))
+        life.step()
+    print(columns)
+    print("")
+
+    height, width, generations = 64, 64, 10
+    print("%dx%d grid, %d generations" % (height, width, generations))
+    grid = random_grid(height, width)
+    life = VectorizedLife(grid)
+
+    sim = simulate(grid.height, grid.width)
+    start = time()
+    for _ in range(generations):
+        grid = live_a_generation(grid, sim)
+    end = time()
+    coroutine_time = end - start
+    print('coroutines: took %.3f seconds, %.0f cells per second' %
+          (coroutine_time, height * width * generations / coroutine_time))
+
+    start = time()
+    life.step(generations)
+    end = time()
+    print('NumPy:      took %.6f seconds, %.0f cells per second' %
+          ((end - start), height * width * generations / (end - start)))
+    assert str(life.to_grid()) == str(grid)
+    print('results match, population %d' % life.population)
+    print("")
+
+    height, width, generations = 1000, 1000, 100
+    life = VectorizedLife(random_grid(height, width))
+    start = time()
+    life.step(generations)
+    end = time()
+    print('NumPy %dx%d, %d generations: took %.3f seconds, '
+          '%.0f cells per second' %
+          (height, width, generations, end - start,
+           height * width * generations / (end - start)))
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+'''
+* Brett Slatkin, 2014, "effective Python"
+* Brett Slatkin's example code([GitHub](https://github.com/bslatkin/effectivepython))
+* I modified the example code a bit to confirm my understanding.
+* item40_sparse.py is written in Python 3.6
+
+Sparse Game of Life for large, mostly empty worlds
+* simulate() visits every (y, x) each tick, even when nearly every cell
+  is EMPTY: the cost follows the area of the world
+* SparseLife stores only the living cells, in a set of (y, x)
+* each tick, every living cell adds one to the count of its 8 neighbors;
+  only cells with a count (or alive) can be alive next tick
+* time and memory follow the population, so a 1M x 1M world holding
+  a few thousand gliders is as cheap as a small one
+'''
+from collections import Counter
+from time import time
+import sys
+
+from item40 import (ALIVE, EMPTY, ColumnPrinter, Grid, live_a_generation,
+                    simulate)
+
+OFFSETS = [(dy, dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1)
+           if (dy, dx) != (0, 0)]
+
+
+class SparseLife(object):
+    def __init__(self, height, width):
+        self.height = height
+        self.width = width
+        self.alive = set()
+        self.generation = 0
+
+    def __str__(self):
+        """Like Grid.__str__: only sensible for small worlds"""
+        rows = [[EMPTY] * self.width for _ in range(self.height)]
+        for y, x in self.alive:
+            rows[y][x] = ALIVE
+        return ''.join(''.join(row) + '\n' for row in rows)
+
+    @property
+    def population(self):
+        return len(self.alive)
+
+    def query(self, y, x):
+        if (y % self.height, x % self.width) in self.alive:
+            return ALIVE
+        return EMPTY
+
+    def assign(self, y, x, state):
+        cell = (y % self.height, x % self.width)
+        if state == ALIVE:
+            self.alive.add(cell)
+        else:
+            self.alive.discard(cell)
+
+    @classmethod
+    def from_grid(cls, grid):
+        result = cls(grid.height, grid.width)
+        result.alive = {(y, x) for y, row in enumerate(grid.rows)
+                        for x, cell in enumerate(row) if cell == ALIVE}
+        return result
+
+    def to_grid(self):
+        grid = Grid(self.height, self.width)
+        for y, x in self.alive:
+            grid.assign(y, x, ALIVE)
+        return grid
+
+    def step(self, generations=1):
+        height, width = self.height, self.width
+        for _ in range(generations):
+            alive = self.alive
+            counts = Counter(((y + dy) % height, (x + dx) % width)
+                             for y, x in alive for dy, dx in OFFSETS)
+            self.alive = {cell for cell, count in counts.items()
+                          if count == 3 or (count == 2 and cell in alive)}
+            self.generation += 1
+
+    def bounding_box(self):
+        if not self.alive:
+            return None
+        ys = [y for y, _ in self.alive]
+        xs = [x for _, x in self.alive]
+        return min(ys), min(xs), max(ys), max(xs)
+
+
+GLIDER = [(0, 1), (1, 2), (2, 0), (2, 1), (2, 2)]
+
+
+def scatter_gliders(world, count, spacing=10):
+    """count gliders on a square lattice in the middle of world"""
+    side = int(count ** 0.5) + 1
+    top = world.height // 2 - side * spacing // 2
+    left = world.width // 2 - side * spacing // 2
+    for i in range(count):
+        y = top + (i // side) * spacing
+        x = left + (i % side) * spacing
+        for dy, dx in GLIDER:
+            world.assign(y + dy, x + dx, ALIVE)
+    return world
+
+
+if __name__=="__main__":
+    print("the glider from item40")
+    world = SparseLife(5, 9)
+    for dy, dx in GLIDER:
+        world.assign(dy, dx + 2, ALIVE)
+    columns = ColumnPrinter()
+    for i in range(5):
+        columns.append(str(world))
+        world.step()
+    print(columns)
+    print("")
+
+    height, width, generations = 40, 40, 10
+    print("same results as the coroutines on a %dx%d grid" % (height, width))
+    grid = scatter_gliders(Grid(height, width), 9)
+    world = SparseLife.from_grid(grid)
+    sim = simulate(height, width)
+    for _ in range(generations):
+        grid = live_a_generation(grid, sim)
+    world.step(generations)
+    assert str(world) == str(grid)
+    assert str(world.to_grid()) == str(grid)
+    print("results match")
+    print("")
+
+    gliders, generations = 2000, 50
+    print("%d gliders, %d generations" % (gliders, generations))
+    for side in (1000, 10 ** 6):
+        world = scatter_gliders(SparseLife(side, side), gliders)
+        start = time()
+        world.step(generations)
+        end = time()
+        print('%7dx%-7d world: took %.3f seconds, population %d, '
+              '%d bytes of cells' %
+              (side, side, end - start, world.population,
+               sys.getsizeof(world.alive) +
+               sum(map(sys.getsizeof, world.alive))))
+        print('    bounding box', world.bounding_box())
+    print("a dense 1M x 1M grid would need 10**12 cells")